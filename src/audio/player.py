@@ -8,24 +8,170 @@ Uses pygame for cross-platform audio playback with support for:
 - Volume and pan control
 """
 
-import os
-import sys
 import io
 import wave
 import struct
 import threading
-import time
-from typing import Optional, Callable
+from collections import OrderedDict
+from fractions import Fraction
+from typing import Optional, Callable, Iterator
 from dataclasses import dataclass
 from enum import Enum
 
 import numpy as np
 
-# Add parent to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from models.korg_types import SampleInfo, Multisample, LoopMode
 
+# Normalisation factors for integer PCM -> float32 [-1, 1]
+_INV_128 = np.float32(1.0 / 128)
+_INV_32768 = np.float32(1.0 / 32768)
+_INV_8388608 = np.float32(1.0 / 8388608)
+_INV_2147483648 = np.float32(1.0 / 2147483648)
+
+# Bytes per sample for each supported bit depth (anything else decodes as 16-bit)
+_SAMPLE_WIDTHS = {8: 1, 16: 2, 24: 3, 32: 4}
+
+# Largest buffer (in float32 values) kept around as playback scratch space;
+# bigger conversions allocate normally so one long sample can't pin memory
+_SCRATCH_MAX_SAMPLES = 1 << 22
+
+# Numba is optional; without it the NumPy paths below are used. The kernels
+# are serial and release the GIL: their callers (playback, export and GUI
+# worker threads) already run concurrently, and numba's parallel loops abort
+# the process when entered from several threads under the workqueue layer.
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# SciPy is optional too; without it resampling interpolates instead of using
+# a polyphase filter
+try:
+    from scipy.signal import resample_poly
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+
+if HAS_NUMBA:
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _decode_24bit_nb(raw, out):
+        """Decode packed little-endian 24-bit samples into float32."""
+        for i in range(out.shape[0]):
+            value = (raw[i * 3]
+                     | (np.int32(raw[i * 3 + 1]) << 8)
+                     | (np.int32(raw[i * 3 + 2]) << 16))
+            if value & 0x800000:
+                value -= 0x1000000
+            out[i] = value * (1.0 / 8388608.0)
+    
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _interp_linear_nb(audio, out):
+        """Linear interpolation of 2-D (frames, channels) audio into out."""
+        last = audio.shape[0] - 1
+        step = last / (out.shape[0] - 1) if out.shape[0] > 1 else 0.0
+        for i in range(out.shape[0]):
+            pos = i * step
+            i1 = int(pos)
+            i2 = min(i1 + 1, last)
+            mu = pos - i1
+            for c in range(audio.shape[1]):
+                out[i, c] = audio[i1, c] * (1.0 - mu) + audio[i2, c] * mu
+    
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _interp_hermite_nb(audio, out):
+        """4-point Hermite interpolation of 2-D audio into out."""
+        last = audio.shape[0] - 1
+        step = last / (out.shape[0] - 1) if out.shape[0] > 1 else 0.0
+        for i in range(out.shape[0]):
+            pos = i * step
+            i1 = int(pos)
+            i0 = max(i1 - 1, 0)
+            i2 = min(i1 + 1, last)
+            i3 = min(i1 + 2, last)
+            mu = pos - i1
+            for c in range(audio.shape[1]):
+                y0 = audio[i0, c]
+                y1 = audio[i1, c]
+                y2 = audio[i2, c]
+                y3 = audio[i3, c]
+                c1 = 0.5 * (y2 - y0)
+                c2 = y0 - 2.5 * y1 + 2.0 * y2 - 0.5 * y3
+                c3 = 0.5 * (y3 - y0) + 1.5 * (y1 - y2)
+                out[i, c] = ((c3 * mu + c2) * mu + c1) * mu + y1
+    
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _float_to_int16_nb(audio, out):
+        """Scale, clip and cast 2-D float audio to int16 frames in one pass.
+        
+        A single input channel is copied to every output channel.
+        """
+        mono = audio.shape[1] == 1
+        for i in range(out.shape[0]):
+            for c in range(out.shape[1]):
+                value = audio[i, 0 if mono else c] * np.float32(32767.0)
+                if value > 32767.0:
+                    value = 32767.0
+                elif value < -32768.0:
+                    value = -32768.0
+                out[i, c] = np.int16(value)
+
+
+
+def _decode_uint8(data) -> np.ndarray:
+    """Decode unsigned 8-bit PCM."""
+    audio = np.empty(len(data), dtype=np.float32)
+    np.subtract(np.frombuffer(data, dtype=np.uint8), 128, out=audio, dtype=np.float32)
+    audio *= _INV_128
+    return audio
+
+
+def _decode_int16(data) -> np.ndarray:
+    """Decode signed 16-bit PCM."""
+    return np.frombuffer(data, dtype=np.int16).astype(np.float32) * _INV_32768
+
+
+def _decode_int24(data) -> np.ndarray:
+    """Decode packed little-endian signed 24-bit PCM."""
+    num_samples = len(data) // 3
+    raw = np.frombuffer(data, dtype=np.uint8, count=num_samples * 3)
+    
+    if HAS_NUMBA:
+        result = np.empty(num_samples, dtype=np.float32)
+        _decode_24bit_nb(raw, result)
+        return result
+    
+    raw = raw.reshape(-1, 3)
+    
+    # Widen each 3-byte little-endian word to 4 bytes, filling the top
+    # byte with the sign so the result can be viewed as int32
+    out = np.zeros((num_samples, 4), dtype=np.uint8)
+    out[:, :3] = raw
+    out[:, 3] = np.where(raw[:, 2] & 0x80, 0xFF, 0x00)
+    
+    ints = out.view('<i4').ravel()
+    return ints.astype(np.float32) * _INV_8388608
+
+
+def _decode_int32(data) -> np.ndarray:
+    """Decode signed 32-bit integer PCM."""
+    return np.frombuffer(data, dtype=np.int32).astype(np.float32) * _INV_2147483648
+
+
+def _decode_float32(data) -> np.ndarray:
+    """Decode 32-bit IEEE float PCM (copied so callers may modify it)."""
+    return np.frombuffer(data, dtype=np.float32).copy()
+
+
+# Decoder per (bit_depth, is_float); unknown formats fall back to 16-bit
+_DECODERS = {
+    (8, False): _decode_uint8,
+    (16, False): _decode_int16,
+    (24, False): _decode_int24,
+    (32, False): _decode_int32,
+    (32, True): _decode_float32,
+}
 
 class PlayerState(Enum):
     """Audio player states."""
@@ -41,6 +187,7 @@ class PlaybackConfig:
     channels: int = 2
     buffer_size: int = 2048
     volume: float = 0.8  # 0.0 to 1.0
+    sound_cache_size: int = 128  # Converted sounds kept per (sample, note)
 
 
 class AudioPlayer:
@@ -55,9 +202,19 @@ class AudioPlayer:
         self.state = PlayerState.STOPPED
         self.current_sample: Optional[SampleInfo] = None
         self._pygame_initialized = False
+        self._mixer = None  # pygame.mixer, bound once in _init_audio
         self._current_channel = None
         self._on_playback_complete: Optional[Callable] = None
         self._playback_thread: Optional[threading.Thread] = None
+        self._monitor_cancel = threading.Event()
+        
+        # Converted sounds keyed by (id(sample), note, quality). The sample is
+        # stored alongside the sound so its id cannot be reused while cached.
+        self._sound_cache: OrderedDict = OrderedDict()
+        # Most recently decoded sample, reused when it is played at other notes
+        self._last_extracted: Optional[tuple] = None
+        # Reusable float32 work buffers for pitch shifting and resampling
+        self._scratch = [np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32)]
         
         self._init_audio()
     
@@ -74,6 +231,7 @@ class AudioPlayer:
                 buffer=self.config.buffer_size
             )
             pygame.mixer.init()
+            self._mixer = pygame.mixer
             self._pygame_initialized = True
             
         except ImportError:
@@ -86,7 +244,8 @@ class AudioPlayer:
     def play_sample(self, sample: SampleInfo, 
                     note: int = None,
                     velocity: int = 100,
-                    loop: bool = None) -> bool:
+                    loop: bool = None,
+                    quality: str = "linear") -> bool:
         """
         Play a sample.
         
@@ -95,6 +254,8 @@ class AudioPlayer:
             note: MIDI note number (for pitch shifting). None = play at original pitch
             velocity: MIDI velocity (0-127) for volume scaling
             loop: Override loop setting. None = use sample's loop mode
+            quality: Interpolation used for pitch/rate conversion,
+                "linear" (cheapest) or "hermite" (4-point cubic, less aliasing)
             
         Returns:
             True if playback started successfully
@@ -108,17 +269,18 @@ class AudioPlayer:
             return False
         
         try:
-            import pygame
-            
             # Stop any current playback
             self.stop()
             
             # Convert sample to pygame-compatible format
-            sound = self._create_pygame_sound(sample, note, velocity)
+            sound = self._get_sound(sample, note, quality)
             
             if sound is None:
                 return False
             
+            # Apply velocity (volume) on the Sound so cached buffers can be reused
+            sound.set_volume((velocity / 127.0) * self.config.volume)
+            
             # Determine if we should loop
             should_loop = loop if loop is not None else (sample.loop_mode != LoopMode.NO_LOOP)
             loops = -1 if should_loop else 0
@@ -130,7 +292,7 @@ class AudioPlayer:
             
             # Start monitoring thread for playback completion
             if not should_loop:
-                self._start_completion_monitor()
+                self._start_completion_monitor(sound.get_length())
             
             return True
             
@@ -138,68 +300,137 @@ class AudioPlayer:
             print(f"Playback error: {e}")
             return False
     
+    def _get_sound(self, sample: SampleInfo,
+                   note: Optional[int],
+                   quality: str = "linear") -> Optional['pygame.mixer.Sound']:
+        """Return a cached Sound for the sample/note, creating it on a miss."""
+        if note == sample.root_key:
+            note = None
+        key = (id(sample), note, quality)
+        
+        cached = self._sound_cache.get(key)
+        if cached is not None and cached[0] is sample:
+            self._sound_cache.move_to_end(key)
+            return cached[1]
+        
+        sound = self._create_pygame_sound(sample, note, quality)
+        if sound is not None:
+            self._sound_cache[key] = (sample, sound)
+            while len(self._sound_cache) > self.config.sound_cache_size:
+                self._sound_cache.popitem(last=False)
+        
+        return sound
+    
+    def clear_cache(self):
+        """Drop all cached sounds and decoded audio."""
+        self._sound_cache.clear()
+        self._last_extracted = None
+    
     def _create_pygame_sound(self, sample: SampleInfo, 
                               note: Optional[int],
-                              velocity: int) -> Optional['pygame.mixer.Sound']:
-        """Create a pygame Sound object from sample data."""
-        import pygame
-        
-        # Extract audio data as numpy array
-        audio = self._extract_audio(sample)
-        
-        if audio is None:
-            return None
+                              quality: str = "linear") -> Optional['pygame.mixer.Sound']:
+        """Create a pygame Sound object from sample data at unity volume."""
+        # Fast path: 16-bit data already in the mixer's format can be handed
+        # to pygame as-is
+        if (note in (None, sample.root_key) and
+                sample.bit_depth == 16 and
+                sample.sample_rate == self.config.sample_rate and
+                sample.channels == self.config.channels and
+                len(sample.raw_data) % (2 * sample.channels) == 0):
+            return self._mixer.Sound(buffer=sample.raw_data)
+        
+        # Extract audio data as numpy array, reusing the last decode if the
+        # same sample is being played at a different note
+        if self._last_extracted is not None and self._last_extracted[0] is sample:
+            audio = self._last_extracted[1]
+        else:
+            audio = self._extract_audio(sample)
+            if audio is None:
+                return None
+            audio.flags.writeable = False
+            self._last_extracted = (sample, audio)
         
         # Apply pitch shifting if needed
         if note is not None and note != sample.root_key:
-            audio = self._pitch_shift(audio, sample.root_key, note, sample.sample_rate)
-        
-        # Apply velocity (volume)
-        volume = (velocity / 127.0) * self.config.volume
-        audio = audio * volume
-        
-        # Ensure stereo output
-        if audio.ndim == 1:
-            audio = np.column_stack([audio, audio])
-        elif audio.shape[1] == 1:
-            audio = np.column_stack([audio[:, 0], audio[:, 0]])
+            audio = self._pitch_shift(audio, sample.root_key, note, sample.sample_rate,
+                                      quality, scratch_slot=0)
         
         # Resample to output sample rate if needed
         if sample.sample_rate != self.config.sample_rate:
-            audio = self._resample(audio, sample.sample_rate, self.config.sample_rate)
+            audio = self._resample(audio, sample.sample_rate, self.config.sample_rate,
+                                   quality, scratch_slot=1)
         
-        # Convert to 16-bit integer
-        audio = np.clip(audio, -1.0, 1.0)
-        audio_int = (audio * 32767).astype(np.int16)
+        # Only the cached decode is read-only; without numba it is scaled
+        # into a scratch buffer rather than modified
+        work = None
+        if not HAS_NUMBA and not audio.flags.writeable:
+            work = self._get_scratch(0, audio.shape)
+        audio_int = self._to_int16_frames(audio, work)
         
         # Create pygame Sound
-        sound = pygame.mixer.Sound(buffer=audio_int.tobytes())
+        sound = self._mixer.Sound(buffer=audio_int)
         
         return sound
     
+    def _to_int16_frames(self, audio: np.ndarray,
+                         work: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Convert float audio in [-1, 1] to interleaved int16 frames.
+        
+        Mono input is duplicated to stereo during the same pass that casts
+        to int16, so no intermediate stereo float buffer is allocated.
+        
+        Args:
+            audio: Float audio, 1-D (mono) or (frames, channels)
+            work: Optional float32 buffer shaped like audio. The NumPy path
+                scales and clips in place, so read-only input is scaled into
+                work (or a new array) instead.
+        """
+        frames_in = audio[:, None] if audio.ndim == 1 else audio
+        channels = 2 if frames_in.shape[1] == 1 else frames_in.shape[1]
+        frames = np.empty((frames_in.shape[0], channels), dtype=np.int16)
+        
+        if HAS_NUMBA and audio.dtype == np.float32:
+            # Scale, clip and cast in a single pass over the input
+            _float_to_int16_nb(np.ascontiguousarray(frames_in), frames)
+            return frames
+        
+        if audio.flags.writeable:
+            work = audio
+        elif work is None:
+            work = np.empty_like(audio)
+        np.multiply(audio, np.float32(32767.0), out=work)
+        np.clip(work, -32768.0, 32767.0, out=work)
+        
+        np.copyto(frames, work[:, None] if work.ndim == 1 else work, casting='unsafe')
+        return frames
+    
+    def _get_scratch(self, slot: int, shape: tuple) -> Optional[np.ndarray]:
+        """
+        Get a view of a reusable float32 buffer with the given shape.
+        
+        Buffers grow to the next power of two so a run of slightly longer
+        samples doesn't reallocate every time. Returns None when the request
+        is larger than _SCRATCH_MAX_SAMPLES.
+        """
+        size = int(np.prod(shape))
+        if size > _SCRATCH_MAX_SAMPLES:
+            return None
+        
+        buffer = self._scratch[slot]
+        if buffer.size < size:
+            buffer = np.empty(1 << max(size - 1, 0).bit_length(), dtype=np.float32)
+            self._scratch[slot] = buffer
+        
+        return buffer[:size].reshape(shape)
+    
     def _extract_audio(self, sample: SampleInfo) -> Optional[np.ndarray]:
         """Extract audio data from sample as float32 numpy array."""
         if sample.raw_data is None:
             return None
         
         try:
-            if sample.bit_depth == 8:
-                audio = np.frombuffer(sample.raw_data, dtype=np.uint8)
-                audio = (audio.astype(np.float32) - 128) / 128
-            elif sample.bit_depth == 16:
-                audio = np.frombuffer(sample.raw_data, dtype=np.int16)
-                audio = audio.astype(np.float32) / 32768
-            elif sample.bit_depth == 24:
-                audio = self._decode_24bit(sample.raw_data)
-            elif sample.bit_depth == 32:
-                audio = np.frombuffer(sample.raw_data, dtype=np.float32)
-                if np.max(np.abs(audio)) > 2.0:
-                    audio = np.frombuffer(sample.raw_data, dtype=np.int32)
-                    audio = audio.astype(np.float32) / 2147483648
-            else:
-                # Default to 16-bit
-                audio = np.frombuffer(sample.raw_data, dtype=np.int16)
-                audio = audio.astype(np.float32) / 32768
+            audio = self._decode_samples(sample, sample.raw_data)
             
             # Reshape for channels
             if sample.channels > 1 and len(audio) >= sample.channels:
@@ -211,29 +442,69 @@ class AudioPlayer:
             print(f"Audio extraction error: {e}")
             return None
     
-    def _decode_24bit(self, data: bytes) -> np.ndarray:
-        """Decode 24-bit audio data."""
-        num_samples = len(data) // 3
-        result = np.zeros(num_samples, dtype=np.float32)
+    def _extract_audio_chunks(self, sample: SampleInfo,
+                              chunk_frames: int = 16384) -> Iterator[np.ndarray]:
+        """
+        Extract audio data as a sequence of float32 blocks.
         
-        for i in range(num_samples):
-            b = data[i*3:(i+1)*3]
-            value = b[0] | (b[1] << 8) | (b[2] << 16)
-            if value & 0x800000:
-                value -= 0x1000000
-            result[i] = value / 8388608.0
+        Each block holds at most chunk_frames frames and has the same
+        shape as _extract_audio's output (1-D for mono, (frames, channels)
+        otherwise). Trailing bytes that do not form a whole frame are dropped.
+        """
+        width = _SAMPLE_WIDTHS.get(sample.bit_depth, 2)
+        frame_bytes = width * max(sample.channels, 1)
+        view = memoryview(sample.raw_data)
+        total = len(view) - len(view) % frame_bytes
+        step = chunk_frames * frame_bytes
+        
+        for start in range(0, total, step):
+            block = self._decode_samples(sample, view[start:min(start + step, total)])
+            if sample.channels > 1:
+                block = block.reshape(-1, sample.channels)
+            yield block
+    
+    def _int16_frame_blocks(self, sample: SampleInfo,
+                            chunk_frames: int = 16384) -> Iterator[np.ndarray]:
+        """
+        Yield 16-bit sample data as int16 frames without a float round trip.
         
-        return result
+        Multichannel data is yielded as a single zero-copy view of raw_data;
+        mono data is duplicated to stereo one block at a time.
+        """
+        channels = max(sample.channels, 1)
+        count = len(sample.raw_data) // (2 * channels) * channels
+        pcm = np.frombuffer(sample.raw_data, dtype=np.int16, count=count).reshape(-1, channels)
+        
+        if channels > 1:
+            yield pcm
+            return
+        
+        for start in range(0, len(pcm), chunk_frames):
+            block = pcm[start:start + chunk_frames]
+            frames = np.empty((len(block), 2), dtype=np.int16)
+            frames[:] = block
+            yield frames
+    
+    def _decode_samples(self, sample: SampleInfo, data) -> np.ndarray:
+        """Decode raw PCM bytes in the sample's format to writable float32."""
+        decoder = _DECODERS.get((sample.bit_depth, sample.is_float and sample.bit_depth == 32),
+                                _decode_int16)
+        return decoder(data)
     
     def _pitch_shift(self, audio: np.ndarray, 
                      root_note: int, 
                      target_note: int,
-                     sample_rate: int) -> np.ndarray:
+                     sample_rate: int,
+                     quality: str = "linear",
+                     scratch_slot: Optional[int] = None) -> np.ndarray:
         """
         Simple pitch shifting by resampling.
         
         Note: This is a basic implementation. For better quality,
         consider using librosa or other DSP libraries.
+        
+        If scratch_slot is given the result is written into that scratch
+        buffer and is only valid until the buffer is next used.
         """
         # Calculate pitch ratio
         semitone_diff = target_note - root_note
@@ -249,21 +520,21 @@ class AudioPlayer:
         if new_length <= 0:
             return audio
         
-        # Linear interpolation for resampling
-        if audio.ndim == 1:
-            indices = np.linspace(0, original_length - 1, new_length)
-            return np.interp(indices, np.arange(original_length), audio)
-        else:
-            result = np.zeros((new_length, audio.shape[1]), dtype=np.float32)
-            indices = np.linspace(0, original_length - 1, new_length)
-            for ch in range(audio.shape[1]):
-                result[:, ch] = np.interp(indices, np.arange(original_length), audio[:, ch])
-            return result
+        out = None
+        if scratch_slot is not None:
+            out = self._get_scratch(scratch_slot, (new_length,) + audio.shape[1:])
+        return self._interpolate(audio, new_length, quality, out)
     
     def _resample(self, audio: np.ndarray, 
                   from_rate: int, 
-                  to_rate: int) -> np.ndarray:
-        """Resample audio to a different sample rate."""
+                  to_rate: int,
+                  quality: str = "linear",
+                  scratch_slot: Optional[int] = None) -> np.ndarray:
+        """
+        Resample audio to a different sample rate.
+        
+        scratch_slot works as in _pitch_shift.
+        """
         if from_rate == to_rate:
             return audio
         
@@ -274,36 +545,117 @@ class AudioPlayer:
         if new_length <= 0:
             return audio
         
-        if audio.ndim == 1:
-            indices = np.linspace(0, original_length - 1, new_length)
-            return np.interp(indices, np.arange(original_length), audio)
-        else:
-            result = np.zeros((new_length, audio.shape[1]), dtype=np.float32)
-            indices = np.linspace(0, original_length - 1, new_length)
-            for ch in range(audio.shape[1]):
-                result[:, ch] = np.interp(indices, np.arange(original_length), audio[:, ch])
-            return result
-    
-    def _start_completion_monitor(self):
-        """Start a thread to monitor when playback completes."""
+        # Rational rate pairs (e.g. 48000/44100 -> 160/147) go through a
+        # band-limited polyphase filter, which avoids the aliasing plain
+        # interpolation produces when downsampling
+        factor = Fraction(to_rate, from_rate)
+        if HAS_SCIPY and factor.denominator <= 1000 and factor.numerator <= 1000:
+            resampled = resample_poly(audio, factor.numerator, factor.denominator,
+                                      axis=0, window=('kaiser', 5.0))
+            return resampled.astype(np.float32, copy=False)
+        
+        out = None
+        if scratch_slot is not None:
+            out = self._get_scratch(scratch_slot, (new_length,) + audio.shape[1:])
+        return self._interpolate(audio, new_length, quality, out)
+    
+    def _interpolate(self, audio: np.ndarray, new_length: int,
+                     quality: str = "linear",
+                     out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Interpolate audio to a new length.
+        
+        Works on mono (1-D) and multichannel (2-D) arrays in a single
+        pass; the floor indices and weights are computed once and
+        broadcast across channels.
+        
+        Args:
+            audio: Source audio
+            new_length: Number of output frames
+            quality: "linear" or "hermite" (4-point, 3rd-order Hermite)
+            out: Optional float32 array of shape (new_length,) + audio.shape[1:]
+                to write the result into
+        """
+        if HAS_NUMBA and audio.dtype == np.float32:
+            frames = np.ascontiguousarray(audio.reshape(len(audio), -1))
+            if out is not None:
+                result = out.reshape(new_length, frames.shape[1])
+            else:
+                result = np.empty((new_length, frames.shape[1]), dtype=np.float32)
+            if quality == "hermite":
+                _interp_hermite_nb(frames, result)
+            else:
+                _interp_linear_nb(frames, result)
+            return result if audio.ndim > 1 else result[:, 0]
+        
+        original_length = len(audio)
+        last = original_length - 1
+        pos = np.linspace(0, last, new_length)
+        i1 = pos.astype(np.int32)
+        mu = (pos - i1).astype(np.float32)
+        if audio.ndim > 1:
+            mu = mu[:, None]
+        
+        if quality == "hermite":
+            # Neighbouring frames, clamped at the edges
+            y0 = audio[np.maximum(i1 - 1, 0)]
+            y1 = audio[i1]
+            y2 = audio[np.minimum(i1 + 1, last)]
+            y3 = audio[np.minimum(i1 + 2, last)]
+            
+            c1 = 0.5 * (y2 - y0)
+            c2 = y0 - 2.5 * y1 + 2.0 * y2 - 0.5 * y3
+            c3 = 0.5 * (y3 - y0) + 1.5 * (y1 - y2)
+            if out is None:
+                return ((c3 * mu + c2) * mu + c1) * mu + y1
+            
+            np.multiply(c3, mu, out=out)
+            out += c2
+            out *= mu
+            out += c1
+            out *= mu
+            out += y1
+            return out
+        
+        i2 = np.minimum(i1 + 1, last)
+        if out is None:
+            return audio[i1] * (1.0 - mu) + audio[i2] * mu
+        
+        np.multiply(audio[i1], 1.0 - mu, out=out)
+        out += audio[i2] * mu
+        return out
+    
+    def _start_completion_monitor(self, duration: float):
+        """
+        Start a thread that fires the completion callback when playback ends.
+        
+        The thread sleeps for the sound's length in a single wait instead of
+        polling; stop() (or a new play) cancels it early. It only re-checks
+        the channel briefly if the sound is still busy at that point, e.g.
+        because playback was paused.
+        """
+        channel = self._current_channel
+        cancel = threading.Event()
+        self._monitor_cancel = cancel
+        
         def monitor():
-            import pygame
-            while self.state == PlayerState.PLAYING:
-                if self._current_channel is None or not self._current_channel.get_busy():
+            timeout = duration
+            while not cancel.wait(timeout):
+                if channel is None or not channel.get_busy():
                     self.state = PlayerState.STOPPED
                     if self._on_playback_complete:
                         self._on_playback_complete()
-                    break
-                time.sleep(0.1)
+                    return
+                timeout = 0.05 if self.state == PlayerState.PLAYING else 0.25
         
         self._playback_thread = threading.Thread(target=monitor, daemon=True)
         self._playback_thread.start()
     
     def stop(self):
         """Stop playback."""
+        self._monitor_cancel.set()
         if self._pygame_initialized:
-            import pygame.mixer
-            pygame.mixer.stop()
+            self._mixer.stop()
         
         self.state = PlayerState.STOPPED
         self.current_sample = None
@@ -311,15 +663,13 @@ class AudioPlayer:
     def pause(self):
         """Pause playback."""
         if self._pygame_initialized and self.state == PlayerState.PLAYING:
-            import pygame.mixer
-            pygame.mixer.pause()
+            self._mixer.pause()
             self.state = PlayerState.PAUSED
     
     def resume(self):
         """Resume paused playback."""
         if self._pygame_initialized and self.state == PlayerState.PAUSED:
-            import pygame.mixer
-            pygame.mixer.unpause()
+            self._mixer.unpause()
             self.state = PlayerState.PLAYING
     
     def set_volume(self, volume: float):
@@ -382,23 +732,28 @@ class AudioPlayer:
             return False
         
         try:
-            audio = self._extract_audio(sample)
-            if audio is None:
-                return False
+            # Mono samples are written as stereo
+            channels = 2 if sample.channels <= 1 else sample.channels
+            width = _SAMPLE_WIDTHS.get(sample.bit_depth, 2)
+            total_frames = len(sample.raw_data) // (width * max(sample.channels, 1))
             
-            # Ensure stereo
-            if audio.ndim == 1:
-                audio = np.column_stack([audio, audio])
-            
-            # Convert to 16-bit
-            audio_int = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
-            
-            # Write WAV file
+            # Stream the conversion in blocks so peak memory stays bounded
             with wave.open(filepath, 'w') as wf:
-                wf.setnchannels(2)
+                wf.setnchannels(channels)
                 wf.setsampwidth(2)  # 16-bit
                 wf.setframerate(sample.sample_rate)
-                wf.writeframes(audio_int.tobytes())
+                wf.setnframes(total_frames)
+                
+                if sample.bit_depth == 16:
+                    blocks = self._int16_frame_blocks(sample)
+                else:
+                    blocks = (self._to_int16_frames(block)
+                              for block in self._extract_audio_chunks(sample))
+                
+                # wave accepts any buffer, so frames are written without
+                # an intermediate bytes copy
+                for frames in blocks:
+                    wf.writeframesraw(frames)
             
             return True
             
@@ -409,9 +764,10 @@ class AudioPlayer:
     def cleanup(self):
         """Clean up audio resources."""
         self.stop()
+        self.clear_cache()
         if self._pygame_initialized:
-            import pygame.mixer
-            pygame.mixer.quit()
+            self._mixer.quit()
+            self._mixer = None
             self._pygame_initialized = False
 
 
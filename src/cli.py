@@ -18,6 +18,7 @@ import sys
 import os
 import argparse
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Ensure src directory is in path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -54,30 +55,33 @@ def print_package_info(package):
 
 def list_contents(package):
     """List all package contents."""
-    print("\n--- Embedded Files ---")
+    # Large packages list thousands of entries, so each section is built
+    # up and written in one go rather than printed line by line
+    lines = ["\n--- Embedded Files ---"]
     for i, f in enumerate(package.embedded_files):
-        print(f"  [{i:3d}] {f.name:<40} {f.file_type:<20} {f.size:>10} bytes")
+        lines.append(f"  [{i:3d}] {f.name:<40} {f.file_type:<20} {f.size:>10} bytes")
     
     if package.samples:
-        print("\n--- Samples ---")
+        lines.append("\n--- Samples ---")
         for i, s in enumerate(package.samples):
             duration = f"{s.duration_seconds:.2f}s"
             info = f"{s.sample_rate}Hz {s.bit_depth}bit {s.channels}ch"
-            print(f"  [{i:3d}] {s.name:<40} {info:<25} {duration}")
+            lines.append(f"  [{i:3d}] {s.name:<40} {info:<25} {duration}")
     
     if package.programs:
-        print("\n--- Programs ---")
+        lines.append("\n--- Programs ---")
         for i, p in enumerate(package.programs):
-            print(f"  [{i:3d}] {p.name:<40} {p.category:<20} Bank {p.bank}")
+            lines.append(f"  [{i:3d}] {p.name:<40} {p.category:<20} Bank {p.bank}")
     
     if package.multisamples:
-        print("\n--- Multisamples ---")
+        lines.append("\n--- Multisamples ---")
         for i, ms in enumerate(package.multisamples):
             zones = f"{len(ms.zones)} zones"
             samples = f"{len(ms.samples)} samples"
-            print(f"  [{i:3d}] {ms.name:<40} {zones:<15} {samples}")
+            lines.append(f"  [{i:3d}] {ms.name:<40} {zones:<15} {samples}")
     
-    print()
+    lines.append("\n")
+    sys.stdout.write("\n".join(lines))
 
 
 def play_sample(package, index: int):
@@ -151,6 +155,9 @@ def export_samples(package, output_dir: str):
     
     print(f"Exporting {len(package.samples)} samples to {output_dir}...")
     
+    # Assign output paths up front so concurrent writers never collide
+    used_paths = set()
+    jobs = []
     for i, sample in enumerate(package.samples):
         # Clean filename
         safe_name = "".join(c for c in sample.name if c.isalnum() or c in " -_").strip()
@@ -161,16 +168,31 @@ def export_samples(package, output_dir: str):
         
         # Handle duplicates
         counter = 1
-        while os.path.exists(filepath):
+        while filepath in used_paths or os.path.exists(filepath):
             filepath = os.path.join(output_dir, f"{safe_name}_{counter}.wav")
             counter += 1
         
-        if player.export_to_wav(sample, filepath):
-            print(f"  ✓ {sample.name} -> {os.path.basename(filepath)}")
-            exported += 1
-        else:
-            print(f"  ✗ {sample.name} (export failed)")
-            errors += 1
+        used_paths.add(filepath)
+        jobs.append((sample, filepath))
+    
+    # Decoding runs in NumPy or serial nogil numba kernels and writing in the
+    # OS, all of which release the GIL, so samples are exported in parallel.
+    # The kernels must stay serial: numba's parallel loops entered from
+    # several threads abort the process under the workqueue threading layer.
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {
+            executor.submit(player.export_to_wav, sample, filepath): (sample, filepath)
+            for sample, filepath in jobs
+        }
+        
+        for future in as_completed(futures):
+            sample, filepath = futures[future]
+            if future.result():
+                print(f"  ✓ {sample.name} -> {os.path.basename(filepath)}")
+                exported += 1
+            else:
+                print(f"  ✗ {sample.name} (export failed)")
+                errors += 1
     
     print()
     print(f"Exported: {exported}")
@@ -225,6 +247,8 @@ Examples:
     parser.add_argument('--export', metavar='DIR', help='Export all samples to directory')
     parser.add_argument('--analyze', action='store_true', help='Analyze file format')
     parser.add_argument('--debug', action='store_true', help='Enable debug output')
+    parser.add_argument('--load-pcm-lazy', action='store_true',
+                        help="Don't keep PCM container bytes in memory (folder SETs)")
     
     args = parser.parse_args()
     
@@ -246,6 +270,8 @@ Examples:
     try:
         parser_obj = SetParser()
         parser_obj.debug = args.debug
+        if args.load_pcm_lazy:
+            parser_obj.folder_parser.load_pcm_data = False
         
         package = parser_obj.parse_file(args.file)
         
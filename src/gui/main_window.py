@@ -11,17 +11,126 @@ import os
 import sys
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Iterator
 from pathlib import Path
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+import numpy as np
 
 # Add parent to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from models.korg_types import SetPackage, SampleInfo, Program, Multisample, EmbeddedFile
+from models.korg_types import SetPackage, SampleInfo, Program, Multisample, EmbeddedFile, LoopMode
 from parsers.set_parser import SetParser
 from audio.player import AudioPlayer, PlayerState
 
+# Printable ASCII maps to itself, every other byte to '.', for the hex view
+_HEX_ASCII_MAP = bytes(b if 32 <= b < 127 else 0x2E for b in range(256))
+
+# Names of all 128 MIDI notes, with middle C (60) as C4
+_PITCH_CLASSES = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
+_NOTE_NAMES = tuple(f"{_PITCH_CLASSES[n % 12]}{(n // 12) - 1}" for n in range(128))
+
+# Rows inserted into the package tree per idle callback when a branch opens
+_TREE_CHUNK_SIZE = 200
+
+# Extensions of the Korg files an opened folder is searched for, lowercase
+# for a single str.endswith test
+_KORG_EXTS = ('.set', '.pcg', '.ksf', '.kmp', '.sty')
+
+# Subfolders that mark an opened folder as a Pa-series folder-based SET
+_SET_MARKER_DIRS = frozenset({'PCM', 'SOUND', 'STYLE', 'MULTISMP'})
+
+# Semitone offsets of the white keys in an octave, and (white key slot,
+# semitone offset) of each black key, for the virtual keyboard
+_WHITE_KEY_OFFSETS = (0, 2, 4, 5, 7, 9, 11)
+_BLACK_KEY_OFFSETS = ((0, 1), (1, 3), (3, 6), (4, 8), (5, 10))
+
+# Details panel templates, filled in with str.format
+_DETAILS_RULE = '=' * 50
+
+_SAMPLE_DETAILS = """Sample: {sample.name}
+{rule}
+
+Audio Properties:
+  Sample Rate: {sample.sample_rate} Hz
+  Bit Depth: {sample.bit_depth}-bit
+  Channels: {sample.channels}
+  Duration: {sample.duration_seconds:.3f} seconds
+  Samples: {sample.num_samples}
+
+Loop Settings:
+  Mode: {sample.loop_mode.name}
+  Start: {sample.loop_start}
+  End: {sample.loop_end}
+
+MIDI Mapping:
+  Root Key: {sample.root_key} ({root_name})
+  Fine Tune: {sample.fine_tune} cents
+
+Data:
+  Offset: {sample.data_offset}
+  Size: {sample.data_size} bytes
+  Has Data: {has_data}
+"""
+
+_PROGRAM_DETAILS = """Program: {program.name}
+{rule}
+
+Bank: {program.bank}
+Number: {program.number}
+Category: {program.category}
+
+Multisamples: {num_multisamples}
+
+Parameters:
+"""
+
+_MULTISAMPLE_DETAILS = """Multisample: {ms.name}
+{rule}
+
+Zones: {num_zones}
+Samples: {num_samples}
+
+Key Zones:
+"""
+
+_EMBEDDED_DETAILS = """Embedded File: {f.name}
+{rule}
+
+Type: {f.file_type}
+Size: {f.size} bytes
+Offset: {f.offset}
+Compressed: {compressed}
+"""
+
+_PACKAGE_DETAILS = """Package: {s[name]}
+{rule}
+
+Model/Version: {model} {s[version]}
+
+Contents:
+  Embedded Files: {s[embedded_files]}
+  Programs: {s[programs]}
+  Multisamples: {s[multisamples]}
+  Samples: {s[samples]}
+  Drum Kits: {s[drum_kits]}
+  Styles: {s[styles]}
+
+File Types Found:
+  {file_types}
+"""
+
+# One zone entry in the multisample details panel
+_ZONE_DETAILS = """
+  Zone {num}:
+    Keys: {zone.low_key} - {zone.high_key} ({low_name} - {high_name})
+    Velocity: {zone.low_velocity} - {zone.high_velocity}
+    Root Key: {zone.root_key} ({root_name})
+    Sample Index: {zone.sample_index}
+"""
+
 
 class MainWindow:
     """Main application window."""
@@ -34,10 +143,32 @@ class MainWindow:
         
         # State
         self.current_package: Optional[SetPackage] = None
+        self._summary: Optional[Dict[str, Any]] = None  # of current_package
         self.parser = SetParser()
         self.player = AudioPlayer()
         self.selected_item = None
         
+        # Short background work (folder scans, package loads, waveform
+        # decoding) shares one pool; the long-sleeping demo playback gets its
+        # own thread so it never holds a worker
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='korg-io')
+        self._load_future: Optional[Future] = None
+        self._scan_future: Optional[Future] = None
+        
+        # Lazily filled tree branches: node id -> (row kind, items)
+        self._branches: Dict[str, tuple] = {}
+        self._branch_fill: Dict[str, int] = {}  # node id -> rows inserted so far
+        self._iid_to_obj: Dict[str, Any] = {}  # row id -> package object
+        
+        # Waveform envelopes: id(sample) -> (sample, width, min, max)
+        self._wave_cache: Dict[int, tuple] = {}
+        self._wave_future: Optional[Future] = None
+        
+        # Pending debounced search callback, and the lowercased tree text it
+        # searches (built on first search after each load)
+        self._search_after_id = None
+        self._search_index: Optional[List[Tuple[str, str, int]]] = None
+        
         # Set up the UI
         self._create_menu()
         self._create_toolbar()
@@ -172,24 +303,27 @@ class MainWindow:
         self.tree.heading('#0', text='Name', anchor='w')
         self.tree.heading('type', text='Type', anchor='w')
         self.tree.heading('info', text='Info', anchor='w')
+        # Fixed-width data columns; only the name column absorbs resizes, so
+        # inserting rows never triggers a column relayout
         self.tree.column('#0', width=200, minwidth=100)
-        self.tree.column('type', width=100, minwidth=60)
-        self.tree.column('info', width=150, minwidth=80)
+        self.tree.column('type', width=100, minwidth=60, stretch=False)
+        self.tree.column('info', width=150, minwidth=80, stretch=False)
         
         # Scrollbars
-        vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        hsb = ttk.Scrollbar(tree_frame, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        self.tree_vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
+        self.tree_hsb = ttk.Scrollbar(tree_frame, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(yscrollcommand=self.tree_vsb.set, xscrollcommand=self.tree_hsb.set)
         
         self.tree.grid(row=0, column=0, sticky='nsew')
-        vsb.grid(row=0, column=1, sticky='ns')
-        hsb.grid(row=1, column=0, sticky='ew')
+        self.tree_vsb.grid(row=0, column=1, sticky='ns')
+        self.tree_hsb.grid(row=1, column=0, sticky='ew')
         tree_frame.rowconfigure(0, weight=1)
         tree_frame.columnconfigure(0, weight=1)
         
         # Bind selection event
         self.tree.bind('<<TreeviewSelect>>', self._on_tree_select)
         self.tree.bind('<Double-1>', self._on_tree_double_click)
+        self.tree.bind('<<TreeviewOpen>>', self._on_tree_open)
     
     def _create_details_panel(self):
         """Create the details panel."""
@@ -218,6 +352,7 @@ class MainWindow:
         
         self.waveform_canvas = tk.Canvas(waveform_frame, bg='#1a1a2e', height=200)
         self.waveform_canvas.pack(fill=tk.BOTH, expand=True)
+        self.waveform_canvas.bind('<Configure>', self._on_waveform_resize)
         
         # Keyboard tab (for testing notes)
         keyboard_frame = ttk.Frame(self.notebook, padding=10)
@@ -230,12 +365,12 @@ class MainWindow:
         self.notebook.add(hex_frame, text="Hex View")
         
         self.hex_text = tk.Text(hex_frame, wrap=tk.NONE, font=('Consolas', 9))
-        hex_scroll_y = ttk.Scrollbar(hex_frame, orient=tk.VERTICAL, command=self.hex_text.yview)
-        hex_scroll_x = ttk.Scrollbar(hex_frame, orient=tk.HORIZONTAL, command=self.hex_text.xview)
-        self.hex_text.configure(yscrollcommand=hex_scroll_y.set, xscrollcommand=hex_scroll_x.set)
+        self.hex_scroll_y = ttk.Scrollbar(hex_frame, orient=tk.VERTICAL, command=self.hex_text.yview)
+        self.hex_scroll_x = ttk.Scrollbar(hex_frame, orient=tk.HORIZONTAL, command=self.hex_text.xview)
+        self.hex_text.configure(yscrollcommand=self.hex_scroll_y.set, xscrollcommand=self.hex_scroll_x.set)
         self.hex_text.grid(row=0, column=0, sticky='nsew')
-        hex_scroll_y.grid(row=0, column=1, sticky='ns')
-        hex_scroll_x.grid(row=1, column=0, sticky='ew')
+        self.hex_scroll_y.grid(row=0, column=1, sticky='ns')
+        self.hex_scroll_x.grid(row=1, column=0, sticky='ew')
         hex_frame.rowconfigure(0, weight=1)
         hex_frame.columnconfigure(0, weight=1)
     
@@ -248,7 +383,6 @@ class MainWindow:
         keyboard_canvas.pack(fill=tk.X, pady=10)
         
         # Draw piano keys
-        white_keys = ['C', 'D', 'E', 'F', 'G', 'A', 'B']
         key_width = 40
         key_height = 100
         
@@ -258,38 +392,26 @@ class MainWindow:
         base_note = 48  # C3
         
         for octave in range(2):
-            for i, key in enumerate(white_keys):
-                note = base_note + octave * 12 + [0, 2, 4, 5, 7, 9, 11][i]
+            for i, offset in enumerate(_WHITE_KEY_OFFSETS):
                 x = (octave * 7 + i) * key_width
-                
                 key_id = keyboard_canvas.create_rectangle(
                     x, 0, x + key_width - 2, key_height,
-                    fill='white', outline='#333'
+                    fill='white', outline='#333', tags=('pianokey',)
                 )
-                self.keyboard_keys[key_id] = note
-                
-                keyboard_canvas.tag_bind(key_id, '<Button-1>', 
-                    lambda e, n=note: self._play_keyboard_note(n))
-        
-        # Black keys
-        black_key_pattern = [1, 1, 0, 1, 1, 1, 0]  # C#, D#, skip, F#, G#, A#, skip
-        black_notes = [1, 3, -1, 6, 8, 10, -1]
+                self.keyboard_keys[key_id] = base_note + octave * 12 + offset
         
+        # Black keys are drawn after the white ones so they sit on top
         for octave in range(2):
-            for i, has_black in enumerate(black_key_pattern):
-                if has_black and black_notes[i] >= 0:
-                    note = base_note + octave * 12 + black_notes[i]
-                    x = (octave * 7 + i) * key_width + key_width * 0.7
-                    
-                    key_id = keyboard_canvas.create_rectangle(
-                        x, 0, x + key_width * 0.6, key_height * 0.6,
-                        fill='#222', outline='#111'
-                    )
-                    self.keyboard_keys[key_id] = note
-                    
-                    keyboard_canvas.tag_bind(key_id, '<Button-1>',
-                        lambda e, n=note: self._play_keyboard_note(n))
+            for i, offset in _BLACK_KEY_OFFSETS:
+                x = (octave * 7 + i) * key_width + key_width * 0.7
+                key_id = keyboard_canvas.create_rectangle(
+                    x, 0, x + key_width * 0.6, key_height * 0.6,
+                    fill='#222', outline='#111', tags=('pianokey',)
+                )
+                self.keyboard_keys[key_id] = base_note + octave * 12 + offset
         
+        # One binding for every key; the handler looks up the clicked item
+        keyboard_canvas.tag_bind('pianokey', '<Button-1>', self._on_piano_click)
         self.keyboard_canvas = keyboard_canvas
     
     def _create_statusbar(self):
@@ -330,6 +452,10 @@ class MainWindow:
     
     def _open_folder(self):
         """Open a folder containing Korg files."""
+        if self._scan_future is not None:
+            self._set_status("A folder scan is already running")
+            return
+        
         folderpath = filedialog.askdirectory(title="Select Folder with Korg Files")
         
         if folderpath:
@@ -339,15 +465,26 @@ class MainWindow:
         """Load a package file."""
         self._set_status(f"Loading: {filepath}")
         
-        def load_thread():
-            try:
-                package = self.parser.parse_file(filepath)
-                self.root.after(0, lambda: self._on_package_loaded(package))
-            except Exception as e:
-                self.root.after(0, lambda: self._on_load_error(str(e)))
+        # A load that is still queued is dropped; one already running is
+        # left to finish but its result is ignored
+        if self._load_future is not None:
+            self._load_future.cancel()
         
-        thread = threading.Thread(target=load_thread)
-        thread.start()
+        future = self._io_pool.submit(self.parser.parse_file, filepath)
+        self._load_future = future
+        future.add_done_callback(lambda f: self.root.after(0, self._on_load_done, f))
+    
+    def _on_load_done(self, future: Future):
+        """Dispatch the result of a background package load."""
+        if future is not self._load_future or future.cancelled():
+            return
+        self._load_future = None
+        
+        error = future.exception()
+        if error is not None:
+            self._on_load_error(str(error))
+        else:
+            self._on_package_loaded(future.result())
     
     def _on_package_loaded(self, package: Optional[SetPackage]):
         """Handle successful package load."""
@@ -356,11 +493,13 @@ class MainWindow:
             return
         
         self.current_package = package
+        self._summary = None
+        self._wave_cache.clear()
         self._populate_tree()
         self._update_package_info()
         self._enable_controls()
         
-        summary = self.parser.get_package_summary(package)
+        summary = self._get_summary()
         self._set_status(f"Loaded: {package.name} - {summary['samples']} samples, "
                         f"{summary['programs']} programs")
     
@@ -369,11 +508,24 @@ class MainWindow:
         self._set_status(f"Error: {error}")
         messagebox.showerror("Load Error", f"Failed to load package:\n{error}")
     
+    def _freeze_tree(self):
+        """Detach the tree from its scrollbars and layout before a bulk insert."""
+        self.tree.configure(yscrollcommand='', xscrollcommand='')
+        self.tree.grid_remove()
+    
+    def _thaw_tree(self):
+        """Reattach the tree after a bulk insert so it lays out once."""
+        self.tree.configure(yscrollcommand=self.tree_vsb.set, xscrollcommand=self.tree_hsb.set)
+        self.tree.grid()
+    
     def _populate_tree(self):
         """Populate the tree view with package contents."""
         # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.tree.delete(*self.tree.get_children())
+        self._branches.clear()
+        self._branch_fill.clear()
+        self._iid_to_obj.clear()
+        self._search_index = None
         
         if not self.current_package:
             return
@@ -383,86 +535,125 @@ class MainWindow:
         # Add root node
         root = self.tree.insert('', 'end', text=pkg.name, values=('Package', pkg.model or 'Unknown'))
         
-        # Embedded files
+        # Only the category nodes are created here; their rows are inserted
+        # when a branch is first opened
         if pkg.embedded_files:
-            files_node = self.tree.insert(root, 'end', text='Files', 
-                                          values=('', f'{len(pkg.embedded_files)} files'))
-            for f in pkg.embedded_files:
-                self.tree.insert(files_node, 'end', text=f.name,
-                               values=(f.file_type, f'{f.size} bytes'),
-                               tags=('embedded',))
-        
-        # Samples
+            self._add_branch(root, 'Files', f'{len(pkg.embedded_files)} files',
+                             'embedded', pkg.embedded_files)
         if pkg.samples:
-            samples_node = self.tree.insert(root, 'end', text='Samples',
-                                            values=('', f'{len(pkg.samples)} samples'))
-            for i, sample in enumerate(pkg.samples):
-                info = f"{sample.sample_rate}Hz, {sample.bit_depth}bit"
-                self.tree.insert(samples_node, 'end', text=sample.name,
-                               values=('Sample', info),
-                               tags=('sample', f'sample_{i}'))
-        
-        # Programs
+            self._add_branch(root, 'Samples', f'{len(pkg.samples)} samples',
+                             'sample', pkg.samples)
         if pkg.programs:
-            prog_node = self.tree.insert(root, 'end', text='Programs',
-                                         values=('', f'{len(pkg.programs)} programs'))
-            for i, prog in enumerate(pkg.programs):
-                self.tree.insert(prog_node, 'end', text=prog.name,
-                               values=('Program', prog.category),
-                               tags=('program', f'program_{i}'))
-        
-        # Multisamples
+            self._add_branch(root, 'Programs', f'{len(pkg.programs)} programs',
+                             'program', pkg.programs)
         if pkg.multisamples:
-            ms_node = self.tree.insert(root, 'end', text='Multisamples',
-                                       values=('', f'{len(pkg.multisamples)} multisamples'))
-            for i, ms in enumerate(pkg.multisamples):
-                info = f"{len(ms.zones)} zones, {len(ms.samples)} samples"
-                self.tree.insert(ms_node, 'end', text=ms.name,
-                               values=('Multisample', info),
-                               tags=('multisample', f'multisample_{i}'))
+            self._add_branch(root, 'Multisamples', f'{len(pkg.multisamples)} multisamples',
+                             'multisample', pkg.multisamples)
         
         # Expand root
         self.tree.item(root, open=True)
     
+    def _add_branch(self, parent: str, text: str, info: str, kind: str, items: list):
+        """Add a category node whose rows are filled in on first open."""
+        node = self.tree.insert(parent, 'end', text=text, values=('', info))
+        # Placeholder child so Tk draws the expander before the rows exist
+        self.tree.insert(node, 'end', text='...')
+        self._branches[node] = (kind, items)
+    
+    def _on_tree_open(self, event):
+        """Handle a tree node being expanded."""
+        self._fill_branch(self.tree.focus())
+    
+    def _fill_branch(self, node: str, all_rows: bool = False):
+        """
+        Replace a category node's placeholder with its rows.
+        
+        Rows are inserted a chunk at a time from idle callbacks so Tk keeps
+        painting and handling input while a large branch fills.
+        
+        Args:
+            node: Category node id
+            all_rows: Insert every remaining row before returning
+        """
+        if node not in self._branches:
+            return
+        
+        if node not in self._branch_fill:
+            self.tree.delete(*self.tree.get_children(node))
+            self._branch_fill[node] = 0
+            if not all_rows:
+                self._fill_branch_chunk(node)
+        
+        if all_rows:
+            self._fill_branch_chunk(node, len(self._branches[node][1]))
+    
+    def _fill_branch_chunk(self, node: str, count: int = _TREE_CHUNK_SIZE):
+        """Insert the next rows of a branch, rescheduling until it is full."""
+        # The tree may have been repopulated since this chunk was scheduled
+        if not self.tree.exists(node):
+            return
+        
+        kind, items = self._branches[node]
+        start = self._branch_fill[node]
+        stop = min(start + count, len(items))
+        if start >= stop:
+            return
+        self._branch_fill[node] = stop
+        
+        self._freeze_tree()
+        try:
+            if kind == 'embedded':
+                for f in items[start:stop]:
+                    iid = self.tree.insert(node, 'end', text=f.name,
+                                         values=(f.file_type, f'{f.size} bytes'),
+                                         tags=('embedded',))
+                    self._iid_to_obj[iid] = f
+            elif kind == 'sample':
+                for sample in items[start:stop]:
+                    info = f"{sample.sample_rate}Hz, {sample.bit_depth}bit"
+                    iid = self.tree.insert(node, 'end', text=sample.name,
+                                         values=('Sample', info),
+                                         tags=('sample',))
+                    self._iid_to_obj[iid] = sample
+            elif kind == 'program':
+                for prog in items[start:stop]:
+                    iid = self.tree.insert(node, 'end', text=prog.name,
+                                         values=('Program', prog.category),
+                                         tags=('program',))
+                    self._iid_to_obj[iid] = prog
+            elif kind == 'multisample':
+                for ms in items[start:stop]:
+                    info = f"{len(ms.zones)} zones, {len(ms.samples)} samples"
+                    iid = self.tree.insert(node, 'end', text=ms.name,
+                                         values=('Multisample', info),
+                                         tags=('multisample',))
+                    self._iid_to_obj[iid] = ms
+        finally:
+            self._thaw_tree()
+        
+        if stop < len(items):
+            self._set_status(f"Loading {self.tree.item(node, 'text')}: {stop}/{len(items)}")
+            self.root.after_idle(self._fill_branch_chunk, node)
+        elif start > 0:
+            self._set_status(f"Loaded {len(items)} {self.tree.item(node, 'text').lower()}")
+    
     def _on_tree_select(self, event):
         """Handle tree selection change."""
         selection = self.tree.selection()
         if not selection:
             return
         
-        item = selection[0]
-        tags = self.tree.item(item, 'tags')
+        self.selected_item = self._iid_to_obj.get(selection[0])
         
-        self.selected_item = None
-        
-        for tag in tags:
-            if tag.startswith('sample_'):
-                idx = int(tag.split('_')[1])
-                if self.current_package and idx < len(self.current_package.samples):
-                    self.selected_item = self.current_package.samples[idx]
-                    self._show_sample_details(self.selected_item)
-                    self._draw_waveform(self.selected_item)
-                break
-            elif tag.startswith('program_'):
-                idx = int(tag.split('_')[1])
-                if self.current_package and idx < len(self.current_package.programs):
-                    self.selected_item = self.current_package.programs[idx]
-                    self._show_program_details(self.selected_item)
-                break
-            elif tag.startswith('multisample_'):
-                idx = int(tag.split('_')[1])
-                if self.current_package and idx < len(self.current_package.multisamples):
-                    self.selected_item = self.current_package.multisamples[idx]
-                    self._show_multisample_details(self.selected_item)
-                break
-            elif tag == 'embedded':
-                # Show embedded file details
-                name = self.tree.item(item, 'text')
-                for f in self.current_package.embedded_files:
-                    if f.name == name:
-                        self.selected_item = f
-                        self._show_embedded_details(f)
-                        break
+        if isinstance(self.selected_item, SampleInfo):
+            self._show_sample_details(self.selected_item)
+            self._draw_waveform(self.selected_item)
+        elif isinstance(self.selected_item, Program):
+            self._show_program_details(self.selected_item)
+        elif isinstance(self.selected_item, Multisample):
+            self._show_multisample_details(self.selected_item)
+        elif isinstance(self.selected_item, EmbeddedFile):
+            self._show_embedded_details(self.selected_item)
         
         # Enable/disable play button
         if isinstance(self.selected_item, (SampleInfo, Multisample)):
@@ -477,81 +668,51 @@ class MainWindow:
     
     def _show_sample_details(self, sample: SampleInfo):
         """Show sample details in the info panel."""
-        info = f"""Sample: {sample.name}
-{'=' * 50}
-
-Audio Properties:
-  Sample Rate: {sample.sample_rate} Hz
-  Bit Depth: {sample.bit_depth}-bit
-  Channels: {sample.channels}
-  Duration: {sample.duration_seconds:.3f} seconds
-  Samples: {sample.num_samples}
-
-Loop Settings:
-  Mode: {sample.loop_mode.name}
-  Start: {sample.loop_start}
-  End: {sample.loop_end}
-
-MIDI Mapping:
-  Root Key: {sample.root_key} ({self._note_name(sample.root_key)})
-  Fine Tune: {sample.fine_tune} cents
-
-Data:
-  Offset: {sample.data_offset}
-  Size: {sample.data_size} bytes
-  Has Data: {'Yes' if sample.raw_data else 'No'}
-"""
-        self._set_info_text(info)
+        self._set_info_text(_SAMPLE_DETAILS.format(
+            sample=sample,
+            rule=_DETAILS_RULE,
+            root_name=self._note_name(sample.root_key),
+            has_data='Yes' if sample.raw_data else 'No'
+        ))
     
     def _show_program_details(self, program: Program):
         """Show program details in the info panel."""
-        info = f"""Program: {program.name}
-{'=' * 50}
-
-Bank: {program.bank}
-Number: {program.number}
-Category: {program.category}
-
-Multisamples: {len(program.multisamples)}
-
-Parameters:
-"""
-        for key, value in program.parameters.items():
-            info += f"  {key}: {value}\n"
+        info = _PROGRAM_DETAILS.format(
+            program=program,
+            rule=_DETAILS_RULE,
+            num_multisamples=len(program.multisamples)
+        )
+        info += ''.join(f"  {key}: {value}\n" for key, value in program.parameters.items())
         
         self._set_info_text(info)
     
     def _show_multisample_details(self, ms: Multisample):
         """Show multisample details in the info panel."""
-        info = f"""Multisample: {ms.name}
-{'=' * 50}
-
-Zones: {len(ms.zones)}
-Samples: {len(ms.samples)}
-
-Key Zones:
-"""
-        for i, zone in enumerate(ms.zones):
-            info += f"""
-  Zone {i+1}:
-    Keys: {zone.low_key} - {zone.high_key} ({self._note_name(zone.low_key)} - {self._note_name(zone.high_key)})
-    Velocity: {zone.low_velocity} - {zone.high_velocity}
-    Root Key: {zone.root_key} ({self._note_name(zone.root_key)})
-    Sample Index: {zone.sample_index}
-"""
+        info = _MULTISAMPLE_DETAILS.format(
+            ms=ms,
+            rule=_DETAILS_RULE,
+            num_zones=len(ms.zones),
+            num_samples=len(ms.samples)
+        )
+        info += ''.join(
+            _ZONE_DETAILS.format(
+                num=i + 1,
+                zone=zone,
+                low_name=self._note_name(zone.low_key),
+                high_name=self._note_name(zone.high_key),
+                root_name=self._note_name(zone.root_key)
+            )
+            for i, zone in enumerate(ms.zones)
+        )
         self._set_info_text(info)
     
     def _show_embedded_details(self, f: EmbeddedFile):
         """Show embedded file details."""
-        info = f"""Embedded File: {f.name}
-{'=' * 50}
-
-Type: {f.file_type}
-Size: {f.size} bytes
-Offset: {f.offset}
-Compressed: {'Yes' if f.compressed else 'No'}
-"""
-        self._set_info_text(info)
+        self._set_info_text(_EMBEDDED_DETAILS.format(
+            f=f,
+            rule=_DETAILS_RULE,
+            compressed='Yes' if f.compressed else 'No'
+        ))
         
         # Show hex view
         if f.data:
@@ -559,17 +720,22 @@ Compressed: {'Yes' if f.compressed else 'No'}
     
     def _show_hex_data(self, data: bytes):
         """Display hex dump of data."""
-        lines = []
-        for i in range(0, len(data), 16):
-            chunk = data[i:i+16]
-            hex_part = ' '.join(f'{b:02X}' for b in chunk)
-            ascii_part = ''.join(chr(b) if 32 <= b < 127 else '.' for b in chunk)
-            lines.append(f'{i:08X}  {hex_part:<48}  {ascii_part}')
-        
-        self.hex_text.config(state='normal')
+        # Hex and ASCII columns are each converted once for the whole block;
+        # every hex byte takes three characters ("XX ")
+        hex_str = data.hex(' ').upper()
+        ascii_str = data.translate(_HEX_ASCII_MAP).decode('ascii')
+        lines = [
+            f'{i:08X}  {hex_str[i * 3:i * 3 + 47]:<48}  {ascii_str[i:i + 16]}'
+            for i in range(0, len(data), 16)
+        ]
+        
+        # Scrollbars are detached for the rewrite so they update once at the end
+        self.hex_text.config(state='normal', yscrollcommand='', xscrollcommand='')
         self.hex_text.delete('1.0', tk.END)
         self.hex_text.insert('1.0', '\n'.join(lines))
-        self.hex_text.config(state='disabled')
+        self.hex_text.config(state='disabled',
+                             yscrollcommand=self.hex_scroll_y.set,
+                             xscrollcommand=self.hex_scroll_x.set)
     
     def _draw_waveform(self, sample: SampleInfo):
         """Draw the waveform for a sample."""
@@ -585,40 +751,109 @@ Compressed: {'Yes' if f.compressed else 'No'}
             )
             return
         
-        try:
-            import numpy as np
-            
-            # Get audio data
-            if sample.bit_depth == 16:
-                audio = np.frombuffer(sample.raw_data, dtype=np.int16)
-                audio = audio.astype(np.float32) / 32768
-            elif sample.bit_depth == 8:
-                audio = np.frombuffer(sample.raw_data, dtype=np.uint8)
-                audio = (audio.astype(np.float32) - 128) / 128
-            else:
-                audio = np.frombuffer(sample.raw_data, dtype=np.int16)
-                audio = audio.astype(np.float32) / 32768
+        # An unmapped canvas (e.g. the Waveform tab has never been shown)
+        # reports a width of 1; <Configure> redraws once it has a real size
+        width = canvas.winfo_width()
+        if width <= 1:
+            return
+        
+        # The envelope only depends on the sample and the canvas width, so
+        # reselecting a sample or a height-only resize skips the decode
+        cached = self._wave_cache.get(id(sample))
+        if cached is not None and cached[0] is sample and cached[1] == width:
+            self._render_waveform(sample, width, cached[2], cached[3])
+            return
+        
+        # Decoding a long sample takes a while, so the envelope is computed on
+        # the background pool and drawn once it is ready
+        if self._wave_future is not None:
+            self._wave_future.cancel()
+        future = self._io_pool.submit(self._compute_waveform_envelope, sample, width)
+        self._wave_future = future
+        future.add_done_callback(
+            lambda f: self.root.after(0, self._on_waveform_ready, f, sample, width))
+    
+    def _on_waveform_ready(self, future: Future, sample: SampleInfo, width: int):
+        """Draw a waveform envelope computed in the background."""
+        # Skip results that a newer draw or a selection change has replaced
+        if future is not self._wave_future or future.cancelled():
+            return
+        self._wave_future = None
+        if sample is not self.selected_item:
+            return
+        
+        error = future.exception()
+        if error is not None:
+            canvas = self.waveform_canvas
+            canvas.create_text(
+                canvas.winfo_width() // 2,
+                canvas.winfo_height() // 2,
+                text=f"Waveform error: {error}",
+                fill='red'
+            )
+            return
+        
+        env_min, env_max = future.result()
+        self._wave_cache[id(sample)] = (sample, width, env_min, env_max)
+        self._render_waveform(sample, width, env_min, env_max)
+    
+    @staticmethod
+    def _compute_waveform_envelope(sample: SampleInfo, width: int):
+        """
+        Reduce a sample to per-column minimum and maximum values.
+        
+        Makes no Tk calls, so it can run on a worker thread.
+        
+        Args:
+            sample: Sample with raw_data populated
+            width: Number of pixel columns
             
-            # Get canvas dimensions
-            width = canvas.winfo_width() or 400
+        Returns:
+            Tuple of (min, max) float32 arrays scaled to [-1, 1]
+        """
+        # Get audio data as a zero-copy integer view. 8-bit data is unsigned
+        # and 16-bit data (and anything else, which is shown as 16-bit) is
+        # signed; since min/max commute with the offset and scale, only the
+        # per-column envelope is converted to float.
+        if sample.bit_depth == 8:
+            audio = np.frombuffer(sample.raw_data, dtype=np.uint8)
+            offset, norm = 128, np.float32(1 / 128)
+        else:
+            audio = np.frombuffer(sample.raw_data, dtype=np.int16)
+            offset, norm = 0, np.float32(1 / 32768)
+        
+        # Min/max envelope per pixel column. Unlike stride slicing this keeps
+        # transients that fall between the kept samples.
+        spp = max(1, len(audio) // width)
+        columns = min(width, len(audio))
+        trimmed = audio[:columns * spp].reshape(columns, spp)
+        env_min = (trimmed.min(axis=1).astype(np.float32) - offset) * norm
+        env_max = (trimmed.max(axis=1).astype(np.float32) - offset) * norm
+        return env_min, env_max
+    
+    def _render_waveform(self, sample: SampleInfo, width: int, env_min, env_max):
+        """Draw a waveform envelope, its center line and loop markers."""
+        canvas = self.waveform_canvas
+        canvas.delete('all')
+        
+        try:
             height = canvas.winfo_height() or 200
             
-            # Downsample for display
-            if len(audio) > width * 2:
-                step = len(audio) // width
-                audio = audio[::step]
-            
-            # Draw waveform
+            # Draw waveform as a single polygon: the max envelope left to
+            # right, then the min envelope back right to left
+            columns = len(env_max)
             center = height // 2
-            points = []
-            
-            for i, sample_val in enumerate(audio):
-                x = int(i * width / len(audio))
-                y = int(center - sample_val * center * 0.8)
-                points.extend([x, y])
+            scale = center * 0.8
+            xs = np.arange(columns) * width // max(columns, 1)
+            points = np.empty((2 * columns, 2), dtype=np.int32)
+            points[:columns, 0] = xs
+            points[:columns, 1] = center - env_max * scale
+            points[columns:, 0] = xs[::-1]
+            points[columns:, 1] = center - env_min[::-1] * scale
+            points = points.ravel().tolist()
             
-            if len(points) >= 4:
-                canvas.create_line(points, fill='#00ff88', width=1)
+            if len(points) >= 6:
+                canvas.create_polygon(points, fill='#00aa66', outline='#00ff88')
             
             # Draw center line
             canvas.create_line(0, center, width, center, fill='#444444', dash=(2, 4))
@@ -639,6 +874,11 @@ Compressed: {'Yes' if f.compressed else 'No'}
                 fill='red'
             )
     
+    def _on_waveform_resize(self, event):
+        """Redraw the selected sample's waveform at the new canvas size."""
+        if isinstance(self.selected_item, SampleInfo):
+            self._draw_waveform(self.selected_item)
+    
     def _play_selected(self):
         """Play the currently selected item."""
         if self.selected_item is None:
@@ -663,6 +903,12 @@ Compressed: {'Yes' if f.compressed else 'No'}
         else:
             self._set_status(f"Failed to play: {sample.name}")
     
+    def _on_piano_click(self, event):
+        """Play the note of the virtual keyboard key under the pointer."""
+        item = self.keyboard_canvas.find_withtag('current')
+        if item:
+            self._play_keyboard_note(self.keyboard_keys[item[0]])
+    
     def _play_keyboard_note(self, note: int):
         """Play a note from the virtual keyboard."""
         if not self.selected_item:
@@ -670,10 +916,10 @@ Compressed: {'Yes' if f.compressed else 'No'}
         
         if isinstance(self.selected_item, SampleInfo):
             self.player.play_sample(self.selected_item, note=note)
-            self._set_status(f"Playing note: {self._note_name(note)}")
+            self._set_status(f"Playing note: {_NOTE_NAMES[note]}")
         elif isinstance(self.selected_item, Multisample):
             self.player.play_note(self.selected_item, note)
-            self._set_status(f"Playing note: {self._note_name(note)}")
+            self._set_status(f"Playing note: {_NOTE_NAMES[note]}")
     
     def _stop_playback(self):
         """Stop audio playback."""
@@ -698,7 +944,6 @@ Compressed: {'Yes' if f.compressed else 'No'}
         
         # Play each sample briefly
         def demo_thread():
-            import time
             for sample in self.current_package.samples[:10]:  # Limit to first 10
                 if not self.player.is_playing():
                     break
@@ -732,41 +977,85 @@ Compressed: {'Yes' if f.compressed else 'No'}
     
     def _scan_folder(self, folderpath: str):
         """Scan a folder for Korg files or load as SET package."""
+        self._set_status(f"Scanning: {folderpath}")
+        
+        # Walking a large tree can take a while, so it runs on the pool too
+        future = self._io_pool.submit(self._find_korg_files, folderpath)
+        self._scan_future = future
+        future.add_done_callback(lambda f: self.root.after(0, self._on_scan_complete, f, folderpath))
+    
+    @staticmethod
+    def _find_korg_files(folderpath: str) -> Tuple[bool, Optional[str]]:
+        """
+        Work out what a folder holds. Makes no Tk calls.
+        
+        Args:
+            folderpath: Folder chosen by the user
+            
+        Returns:
+            Tuple of (is the folder itself a SET package, first Korg file
+            found below it or None). The file is None for a SET package.
+        """
         # Check if folder itself is a SET package (Pa-series folder-based format)
         folder_name = os.path.basename(folderpath)
         if folder_name.upper().endswith('.SET'):
-            # Treat as folder-based SET package
-            self._load_package(folderpath)
-            return
+            return True, None
         
         # Check for Pa-series folder structure (PCM, SOUND, STYLE folders)
-        expected_subfolders = {'PCM', 'SOUND', 'STYLE', 'MULTISMP'}
-        actual_subfolders = set()
-        for item in os.listdir(folderpath):
-            item_path = os.path.join(folderpath, item)
-            if os.path.isdir(item_path):
-                actual_subfolders.add(item.upper())
-        
-        if actual_subfolders & expected_subfolders:
-            # This looks like a Pa-series SET folder
-            self._load_package(folderpath)
+        with os.scandir(folderpath) as it:
+            actual_subfolders = {entry.name.upper() for entry in it
+                                 if entry.is_dir(follow_symlinks=False)}
+        
+        if actual_subfolders & _SET_MARKER_DIRS:
+            return True, None
+        
+        # Otherwise look for an individual Korg file; only the first one is
+        # loaded, so the walk stops there
+        return False, next(MainWindow._iter_korg_files(folderpath), None)
+    
+    @staticmethod
+    def _iter_korg_files(folderpath: str) -> Iterator[str]:
+        """
+        Yield the Korg files below a folder as they are found.
+        
+        scandir entries carry their type from the directory listing, so this
+        needs no stat() per entry, and folders are only listed as far as the
+        caller consumes.
+        """
+        pending = [folderpath]
+        
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as it:
+                    entries = list(it)
+            except OSError:
+                # Unreadable folders are skipped, as os.walk does
+                continue
+            
+            for entry in entries:
+                if entry.is_dir():
+                    # Like os.walk, list symlinked folders but don't enter them
+                    if not entry.is_symlink():
+                        pending.append(entry.path)
+                elif entry.name.lower().endswith(_KORG_EXTS):
+                    yield entry.path
+    
+    def _on_scan_complete(self, future: Future, folderpath: str):
+        """Act on the result of a background folder scan."""
+        self._scan_future = None
+        
+        error = future.exception()
+        if error is not None:
+            self._on_load_error(str(error))
             return
         
-        # Otherwise, scan for individual Korg files
-        extensions = {'.set', '.pcg', '.ksf', '.kmp', '.sty'}
-        files = []
-        
-        for root, dirs, filenames in os.walk(folderpath):
-            for filename in filenames:
-                ext = os.path.splitext(filename)[1].lower()
-                if ext in extensions:
-                    files.append(os.path.join(root, filename))
-        
-        if files:
-            self._set_status(f"Found {len(files)} Korg files")
-            # Load the first one as an example
-            if files:
-                self._load_package(files[0])
+        is_set_folder, first_file = future.result()
+        if is_set_folder:
+            # Treat as folder-based SET package
+            self._load_package(folderpath)
+        elif first_file:
+            self._set_status("Found Korg file")
+            self._load_package(first_file)
         else:
             self._set_status("No Korg files found in folder")
             messagebox.showinfo("Scan", "No Korg files found in the selected folder")
@@ -776,25 +1065,20 @@ Compressed: {'Yes' if f.compressed else 'No'}
         if not self.current_package:
             return
         
-        summary = self.parser.get_package_summary(self.current_package)
+        summary = self._get_summary()
         
-        info = f"""Package: {summary['name']}
-{'=' * 50}
-
-Model/Version: {summary['model'] or 'Unknown'} {summary['version']}
-
-Contents:
-  Embedded Files: {summary['embedded_files']}
-  Programs: {summary['programs']}
-  Multisamples: {summary['multisamples']}
-  Samples: {summary['samples']}
-  Drum Kits: {summary['drum_kits']}
-  Styles: {summary['styles']}
-
-File Types Found:
-  {', '.join(summary['file_types']) if summary['file_types'] else 'None'}
-"""
-        self._set_info_text(info)
+        self._set_info_text(_PACKAGE_DETAILS.format(
+            s=summary,
+            rule=_DETAILS_RULE,
+            model=summary['model'] or 'Unknown',
+            file_types=', '.join(summary['file_types']) if summary['file_types'] else 'None'
+        ))
+    
+    def _get_summary(self) -> Dict[str, Any]:
+        """Return the current package's summary, computed once per package."""
+        if self._summary is None:
+            self._summary = self.parser.get_package_summary(self.current_package)
+        return self._summary
     
     def _enable_controls(self):
         """Enable controls after loading a package."""
@@ -813,30 +1097,52 @@ File Types Found:
         self.status_label.config(text=message)
     
     def _on_search(self, *args):
-        """Handle search input."""
+        """Handle search input, running the search once typing pauses."""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(150, self._do_search)
+    
+    def _do_search(self):
+        """Select the first tree item matching the search text."""
+        self._search_after_id = None
         query = self.search_var.get().lower()
         if not query or not self.current_package:
             return
         
-        # Search through tree items
-        for item in self.tree.get_children():
-            self._search_tree_item(item, query)
+        if self._search_index is None:
+            self._search_index = self._build_search_index()
+        
+        for text, node, row in self._search_index:
+            if query in text:
+                if row >= 0:
+                    # The row may be in a branch that hasn't been filled yet
+                    self._fill_branch(node, all_rows=True)
+                    node = self.tree.get_children(node)[row]
+                self.tree.see(node)
+                self.tree.selection_set(node)
+                return
     
-    def _search_tree_item(self, item, query):
-        """Recursively search tree items."""
-        text = self.tree.item(item, 'text').lower()
-        
-        if query in text:
-            self.tree.see(item)
-            self.tree.selection_set(item)
-            return True
-        
-        for child in self.tree.get_children(item):
-            if self._search_tree_item(child, query):
-                self.tree.item(item, open=True)
-                return True
-        
-        return False
+    def _build_search_index(self) -> List[Tuple[str, str, int]]:
+        """
+        List every tree entry's lowercased text in tree order.
+        
+        Rows of lazily filled branches are taken from the package objects,
+        so they are searchable before their branch is opened.
+        
+        Returns:
+            List of (text, node id, row). For branch rows, node is the
+            category node and row the index of the row within it; other
+            entries have a row of -1.
+        """
+        index = []
+        for top in self.tree.get_children():
+            index.append((self.tree.item(top, 'text').lower(), top, -1))
+            for node in self.tree.get_children(top):
+                index.append((self.tree.item(node, 'text').lower(), node, -1))
+                if node in self._branches:
+                    index.extend((item.name.lower(), node, row)
+                                 for row, item in enumerate(self._branches[node][1]))
+        return index
     
     def _show_package_info(self):
         """Show package info dialog."""
@@ -914,24 +1220,25 @@ Some packages may not be fully supported."""
     
     def _note_name(self, note: int) -> str:
         """Convert MIDI note number to note name."""
-        notes = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-        octave = (note // 12) - 1
-        name = notes[note % 12]
-        return f"{name}{octave}"
+        if 0 <= note < 128:
+            return _NOTE_NAMES[note]
+        # Header fields such as a KSF root key are not range-checked
+        return f"{_PITCH_CLASSES[note % 12]}{(note // 12) - 1}"
     
     def _on_close(self):
         """Handle window close."""
         self.player.cleanup()
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
         self.root.destroy()
 
 
-def create_gui() -> tk.Tk:
-    """Create and return the main GUI window."""
+def create_gui() -> Tuple[tk.Tk, MainWindow]:
+    """Create the main GUI window and return it with its MainWindow."""
     root = tk.Tk()
     app = MainWindow(root)
-    return root
+    return root, app
 
 
 if __name__ == "__main__":
-    root = create_gui()
+    root, app = create_gui()
     root.mainloop()
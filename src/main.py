@@ -41,11 +41,11 @@ def main():
     try:
         from gui.main_window import create_gui
         
-        root = create_gui()
+        root, app = create_gui()
         
         # If a file was specified, load it after GUI starts
         if package_file:
-            root.after(100, lambda: _load_initial_file(root, package_file))
+            root.after(100, lambda: app._load_package(package_file))
         
         root.mainloop()
         return 0
@@ -59,27 +59,5 @@ def main():
         return 1
 
 
-def _load_initial_file(root, filepath):
-    """Load a file after GUI initialization."""
-    # Find the MainWindow instance
-    for child in root.children.values():
-        if hasattr(child, 'master'):
-            continue
-    
-    # Access the main window through the root's internal state
-    # The create_gui function creates MainWindow which stores itself
-    if hasattr(root, 'children'):
-        # Get the main app from the root
-        import gui.main_window as main_module
-        for obj in dir(main_module):
-            item = getattr(main_module, obj)
-            if isinstance(item, main_module.MainWindow):
-                item._load_package(filepath)
-                return
-    
-    # Alternative: Just trigger the load through the window
-    print(f"Note: Please use File > Open to load {filepath}")
-
-
 if __name__ == "__main__":
     sys.exit(main())
@@ -3,7 +3,8 @@ Korg data type models for representing synthesizer package structures.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from itertools import chain
+from typing import List, Optional, Dict, Any, Iterator
 from enum import Enum, IntEnum
 import struct
 
@@ -26,7 +27,7 @@ class LoopMode(IntEnum):
     REVERSE = 3
 
 
-@dataclass
+@dataclass(slots=True)
 class SampleInfo:
     """Information about a single audio sample."""
     name: str
@@ -42,6 +43,7 @@ class SampleInfo:
     data_offset: int = 0
     data_size: int = 0
     raw_data: Optional[bytes] = None
+    is_float: bool = False  # 32-bit data is IEEE float rather than int32
     
     @property
     def duration_seconds(self) -> float:
@@ -51,7 +53,7 @@ class SampleInfo:
         return 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class KeyZone:
     """Defines a keyboard zone for sample mapping."""
     low_key: int = 0
@@ -65,15 +67,58 @@ class KeyZone:
     pan: int = 64  # Center
 
 
-@dataclass
+@dataclass(slots=True)
 class Multisample:
     """A multisample consists of multiple samples mapped across the keyboard."""
     name: str
     zones: List[KeyZone] = field(default_factory=list)
     samples: List[SampleInfo] = field(default_factory=list)
+    # Lazily built note x velocity -> sample index table, and the
+    # (zones list, zone count, sample count) it was built for
+    _zone_table: Optional[List[List[Optional[int]]]] = field(
+        default=None, init=False, repr=False, compare=False)
+    _zone_table_key: Optional[tuple] = field(
+        default=None, init=False, repr=False, compare=False)
     
     def get_sample_for_note(self, note: int, velocity: int = 100) -> Optional[SampleInfo]:
         """Find the appropriate sample for a given note and velocity."""
+        if not (0 <= note < 128 and 0 <= velocity < 128):
+            return self._scan_zones(note, velocity)
+        
+        key = (id(self.zones), len(self.zones), len(self.samples))
+        if self._zone_table is None or self._zone_table_key != key:
+            self._build_zone_table()
+            self._zone_table_key = key
+        
+        idx = self._zone_table[note][velocity]
+        return self.samples[idx] if idx is not None else None
+    
+    def invalidate_zone_table(self):
+        """Drop the cached zone lookup; call after editing zones in place."""
+        self._zone_table = None
+    
+    def _build_zone_table(self):
+        """Precompute the sample index for every MIDI note and velocity."""
+        table = [[None] * 128 for _ in range(128)]
+        num_samples = len(self.samples)
+        
+        # Zones are written last to first so that, as in a linear scan, the
+        # first matching zone wins; zones past the sample list never match
+        for zone in reversed(self.zones):
+            if zone.sample_index >= num_samples:
+                continue
+            low_vel = max(zone.low_velocity, 0)
+            high_vel = min(zone.high_velocity, 127)
+            if low_vel > high_vel:
+                continue
+            fill = [zone.sample_index] * (high_vel - low_vel + 1)
+            for key in range(max(zone.low_key, 0), min(zone.high_key, 127) + 1):
+                table[key][low_vel:high_vel + 1] = fill
+        
+        self._zone_table = table
+    
+    def _scan_zones(self, note: int, velocity: int) -> Optional[SampleInfo]:
+        """Find the sample for a note by scanning the zones in order."""
         for zone in self.zones:
             if (zone.low_key <= note <= zone.high_key and
                 zone.low_velocity <= velocity <= zone.high_velocity):
@@ -82,7 +127,7 @@ class Multisample:
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class Program:
     """A program/patch/sound definition."""
     name: str
@@ -93,7 +138,7 @@ class Program:
     parameters: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass 
+@dataclass(slots=True)
 class DrumKit:
     """A drum kit with samples mapped to keys."""
     name: str
@@ -104,7 +149,7 @@ class DrumKit:
         return self.key_samples.get(key)
 
 
-@dataclass
+@dataclass(slots=True)
 class StyleElement:
     """An element within a style (intro, variation, fill, ending)."""
     name: str
@@ -113,7 +158,7 @@ class StyleElement:
     time_signature: tuple = (4, 4)
 
 
-@dataclass
+@dataclass(slots=True)
 class Style:
     """A rhythm style containing multiple elements."""
     name: str
@@ -123,7 +168,7 @@ class Style:
     # Common elements: Intro1, Intro2, Var1-4, Fill1-4, Ending1, Ending2
 
 
-@dataclass
+@dataclass(slots=True)
 class EmbeddedFile:
     """Represents a file embedded within a .SET package."""
     name: str
@@ -134,7 +179,7 @@ class EmbeddedFile:
     data: Optional[bytes] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SetPackage:
     """Represents a complete Korg .SET package."""
     name: str
@@ -147,21 +192,47 @@ class SetPackage:
     drum_kits: List[DrumKit] = field(default_factory=list)
     styles: List[Style] = field(default_factory=list)
     raw_data: Optional[bytes] = None
+    # Distinct embedded file types and the embedded file count they cover
+    _file_types_cache: Optional[set] = field(
+        default=None, init=False, repr=False, compare=False)
+    _file_types_count: int = field(
+        default=0, init=False, repr=False, compare=False)
+    
+    def add_embedded_file(self, embedded: EmbeddedFile):
+        """Append an embedded file, keeping the file type cache current."""
+        current = (self._file_types_cache is not None and
+                   self._file_types_count == len(self.embedded_files))
+        self.embedded_files.append(embedded)
+        if current:
+            self._file_types_cache.add(embedded.file_type)
+            self._file_types_count += 1
+    
+    def get_file_types(self) -> set:
+        """
+        Get the distinct embedded file types.
+        
+        The set is cached; files appended to embedded_files directly (bulk
+        loads) are noticed by count and trigger a rebuild.
+        """
+        if (self._file_types_cache is None or
+                self._file_types_count != len(self.embedded_files)):
+            self._file_types_cache = {f.file_type for f in self.embedded_files}
+            self._file_types_count = len(self.embedded_files)
+        return self._file_types_cache
     
     def get_all_playable_items(self) -> List[tuple]:
         """Get a list of all items that can be played (name, type, object)."""
-        items = []
-        for prog in self.programs:
-            items.append((prog.name, "Program", prog))
-        for ms in self.multisamples:
-            items.append((ms.name, "Multisample", ms))
-        for sample in self.samples:
-            items.append((sample.name, "Sample", sample))
-        for dk in self.drum_kits:
-            items.append((dk.name, "DrumKit", dk))
-        for style in self.styles:
-            items.append((style.name, "Style", style))
-        return items
+        return list(self.iter_playable_items())
+    
+    def iter_playable_items(self) -> Iterator[tuple]:
+        """Iterate over playable items (name, type, object) without building a list."""
+        return chain(
+            ((prog.name, "Program", prog) for prog in self.programs),
+            ((ms.name, "Multisample", ms) for ms in self.multisamples),
+            ((sample.name, "Sample", sample) for sample in self.samples),
+            ((dk.name, "DrumKit", dk) for dk in self.drum_kits),
+            ((style.name, "Style", style) for style in self.styles),
+        )
 
 
 # Common Korg file signatures/magic bytes
@@ -183,7 +254,8 @@ def identify_file_type(data: bytes) -> str:
     if len(data) < 4:
         return "Unknown"
     
-    header = data[:4]
+    # bytes() so slices of an mmap or memoryview hash like the dict keys
+    header = bytes(data[:4])
     
     # Check for WAV audio first (special case of RIFF)
     if header == b'RIFF' and len(data) >= 12:
@@ -191,8 +263,5 @@ def identify_file_type(data: bytes) -> str:
             return "WAV Audio"
         return "RIFF Container (may contain Korg data)"
     
-    for sig, name in KORG_SIGNATURES.items():
-        if data.startswith(sig):
-            return name
-    
-    return "Unknown"
+    # Every signature is exactly four bytes, so the header is the dict key
+    return KORG_SIGNATURES.get(header, "Unknown")
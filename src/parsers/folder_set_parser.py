@@ -15,9 +15,12 @@ This parser reads the folder structure and extracts all contents.
 """
 
 import os
+import mmap
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -29,6 +32,23 @@ from parsers.pcm_parser import PCMParser
 from parsers.pcg_parser import PCGParser
 from parsers.kmp_parser import KMPParser
 
+# Concurrent file reads per subfolder; reads release the GIL, so this keeps
+# the disk busy while parsing proceeds
+_READ_WORKERS = 8
+
+# File types of the parsed subfolders, interned so that the type sets built
+# for summaries compare by identity
+_PCM_FILE_TYPE = sys.intern('PCM Audio Container')
+_PCG_FILE_TYPE = sys.intern('Program Collection')
+_KMP_FILE_TYPE = sys.intern('Multisample Map')
+_STY_FILE_TYPE = sys.intern('Style/Rhythm')
+
+
+def _read_file(path: str) -> bytes:
+    """Read a whole file."""
+    with open(path, 'rb') as f:
+        return f.read()
+
 
 class FolderSetParser:
     """Parser for folder-based Korg Pa-series SET packages."""
@@ -47,6 +67,9 @@ class FolderSetParser:
     
     def __init__(self):
         self.debug = False
+        # Keep each PCM container's bytes on its EmbeddedFile; samples are
+        # extracted either way
+        self.load_pcm_data = True
         self.pcm_parser = PCMParser()
         self.pcg_parser = PCGParser()
         self.kmp_parser = KMPParser()
@@ -73,140 +96,196 @@ class FolderSetParser:
             model='Pa-series'
         )
         
-        # Process each subfolder
-        for subfolder_name, description in self.FOLDERS.items():
-            subfolder = folder / subfolder_name
-            if subfolder.exists() and subfolder.is_dir():
-                self._process_subfolder(subfolder, subfolder_name, package)
+        # Subfolders are independent, so each one is processed concurrently
+        # into its own partial package. Merging the parts here, in FOLDERS
+        # order, keeps the result deterministic and avoids sharing lists
+        # between threads.
+        subfolders = [name for name in self.FOLDERS if (folder / name).is_dir()]
+        if not subfolders:
+            return package
+        
+        def process(subfolder_name: str) -> SetPackage:
+            part = SetPackage(name=package.name)
+            self._process_subfolder(folder / subfolder_name, subfolder_name, part)
+            return part
+        
+        with ThreadPoolExecutor(max_workers=len(subfolders)) as pool:
+            parts = list(pool.map(process, subfolders))
+        
+        # Bulk extends; get_file_types() rebuilds its cache on the next call
+        for part in parts:
+            package.embedded_files.extend(part.embedded_files)
+            package.samples.extend(part.samples)
+            package.programs.extend(part.programs)
+            package.multisamples.extend(part.multisamples)
+            package.styles.extend(part.styles)
         
         return package
     
     def _process_subfolder(self, subfolder: Path, folder_type: str, package: SetPackage):
         """Process a subfolder based on its type."""
+        files = self._list_files(subfolder)
         
         if folder_type == 'PCM':
-            self._process_pcm_folder(subfolder, package)
+            self._process_pcm_folder(files.get('.PCM', []), package)
         elif folder_type == 'SOUND':
-            self._process_sound_folder(subfolder, package)
+            self._process_sound_folder(files.get('.PCG', []), package)
         elif folder_type == 'MULTISMP':
-            self._process_multismp_folder(subfolder, package)
+            self._process_multismp_folder(files.get('.KMP', []), package)
         elif folder_type == 'STYLE':
-            self._process_style_folder(subfolder, package)
+            self._process_style_folder(files.get('.STY', []), package)
         else:
             # Just catalog the files
-            self._catalog_folder(subfolder, folder_type, package)
+            self._catalog_folder(files, folder_type, package)
     
-    def _process_pcm_folder(self, folder: Path, package: SetPackage):
+    def _process_pcm_folder(self, files: List[Tuple[str, str, int]], package: SetPackage):
         """Process PCM sample files."""
-        for file_path in sorted(folder.glob('*.PCM')):
+        for name, file_path, size in files:
             if self.debug:
-                print(f"Processing PCM: {file_path.name}")
+                print(f"Processing PCM: {name}")
             
-            # Add as embedded file
-            with open(file_path, 'rb') as f:
-                data = f.read()
+            # PCM containers run to hundreds of MB, so they are memory-mapped
+            # rather than read: the parser only pages in what it slices, and
+            # the container bytes are copied out only if they are kept
+            if size:
+                with open(file_path, 'rb') as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        # Parse samples from PCM
+                        samples = self.pcm_parser.parse(data, name)
+                        container = data[:] if self.load_pcm_data else None
+            else:
+                samples = []
+                container = b'' if self.load_pcm_data else None
             
+            # Add as embedded file
             embedded = EmbeddedFile(
-                name=file_path.name,
-                file_type='PCM Audio Container',
+                name=name,
+                file_type=_PCM_FILE_TYPE,
                 offset=0,
-                size=len(data),
-                data=data
+                size=size,
+                data=container
             )
-            package.embedded_files.append(embedded)
-            
-            # Parse samples from PCM
-            samples = self.pcm_parser.parse(data, file_path.name)
+            package.add_embedded_file(embedded)
             package.samples.extend(samples)
     
-    def _process_sound_folder(self, folder: Path, package: SetPackage):
+    def _process_sound_folder(self, files: List[Tuple[str, str, int]], package: SetPackage):
         """Process sound/program files."""
-        for file_path in sorted(folder.glob('*.PCG')):
+        contents = self._read_files([file_path for _, file_path, _ in files])
+        for (name, _, size), data in zip(files, contents):
             if self.debug:
-                print(f"Processing PCG: {file_path.name}")
-            
-            with open(file_path, 'rb') as f:
-                data = f.read()
+                print(f"Processing PCG: {name}")
             
             embedded = EmbeddedFile(
-                name=file_path.name,
-                file_type='Program Collection',
+                name=name,
+                file_type=_PCG_FILE_TYPE,
                 offset=0,
-                size=len(data),
+                size=size,
                 data=data
             )
-            package.embedded_files.append(embedded)
+            package.add_embedded_file(embedded)
             
             # Parse programs
-            programs = self.pcg_parser.parse(data, file_path.name)
+            programs = self.pcg_parser.parse(data, name)
             package.programs.extend(programs)
     
-    def _process_multismp_folder(self, folder: Path, package: SetPackage):
+    def _process_multismp_folder(self, files: List[Tuple[str, str, int]], package: SetPackage):
         """Process multisample definition files."""
-        for file_path in sorted(folder.glob('*.KMP')):
+        contents = self._read_files([file_path for _, file_path, _ in files])
+        for (name, _, size), data in zip(files, contents):
             if self.debug:
-                print(f"Processing KMP: {file_path.name}")
-            
-            with open(file_path, 'rb') as f:
-                data = f.read()
+                print(f"Processing KMP: {name}")
             
             embedded = EmbeddedFile(
-                name=file_path.name,
-                file_type='Multisample Map',
+                name=name,
+                file_type=_KMP_FILE_TYPE,
                 offset=0,
-                size=len(data),
+                size=size,
                 data=data
             )
-            package.embedded_files.append(embedded)
+            package.add_embedded_file(embedded)
             
             # Parse multisample
-            ms = self.kmp_parser.parse(data, file_path.name)
+            ms = self.kmp_parser.parse(data, name)
             if ms:
                 package.multisamples.append(ms)
     
-    def _process_style_folder(self, folder: Path, package: SetPackage):
+    def _process_style_folder(self, files: List[Tuple[str, str, int]], package: SetPackage):
         """Process style files."""
-        for file_path in sorted(folder.glob('*.STY')):
+        contents = self._read_files([file_path for _, file_path, _ in files])
+        for (name, _, size), data in zip(files, contents):
             if self.debug:
-                print(f"Processing STY: {file_path.name}")
-            
-            with open(file_path, 'rb') as f:
-                data = f.read()
+                print(f"Processing STY: {name}")
             
             embedded = EmbeddedFile(
-                name=file_path.name,
-                file_type='Style/Rhythm',
+                name=name,
+                file_type=_STY_FILE_TYPE,
                 offset=0,
-                size=len(data),
+                size=size,
                 data=data
             )
-            package.embedded_files.append(embedded)
+            package.add_embedded_file(embedded)
             
             # Create basic style entry
             style = Style(
-                name=file_path.stem,
+                name=os.path.splitext(name)[0],
                 tempo=120.0
             )
             package.styles.append(style)
     
-    def _catalog_folder(self, folder: Path, folder_type: str, package: SetPackage):
-        """Catalog files in a folder without deep parsing."""
-        for file_path in folder.iterdir():
-            if file_path.is_file():
+    def _list_files(self, folder: Path) -> Dict[str, List[Tuple[str, str, int]]]:
+        """
+        List the files in a folder, grouped by extension.
+        
+        Uses a single scandir pass. DirEntry caches its stat result (on
+        Windows it comes with the directory listing itself), so sizes cost
+        no extra syscalls. Extensions are uppercased, as Pa-series media is
+        usually FAT formatted and names come in any case.
+        
+        Args:
+            folder: Folder to list
+            
+        Returns:
+            Dict mapping an uppercase extension including the dot, e.g.
+            '.PCM', to a list of (name, path, size) sorted by name
+        """
+        files = {}
+        with os.scandir(folder) as it:
+            for entry in it:
                 try:
-                    size = file_path.stat().st_size
-                    
-                    embedded = EmbeddedFile(
-                        name=f"{folder_type}/{file_path.name}",
-                        file_type=folder_type,
-                        offset=0,
-                        size=size,
-                        data=None  # Don't load data for unknown files
-                    )
-                    package.embedded_files.append(embedded)
-                except Exception as e:
+                    if not entry.is_file():
+                        continue
+                    size = entry.stat().st_size
+                except OSError as e:
                     if self.debug:
-                        print(f"Error cataloging {file_path}: {e}")
+                        print(f"Error reading {entry.path}: {e}")
+                    continue
+                ext = os.path.splitext(entry.name)[1].upper()
+                files.setdefault(ext, []).append((entry.name, entry.path, size))
+        
+        for entries in files.values():
+            entries.sort()
+        return files
+    
+    def _read_files(self, paths: List[str]) -> List[bytes]:
+        """Read the given files concurrently, returning their contents in order."""
+        if len(paths) < 2:
+            return [_read_file(path) for path in paths]
+        with ThreadPoolExecutor(max_workers=min(_READ_WORKERS, len(paths))) as pool:
+            return list(pool.map(_read_file, paths))
+    
+    def _catalog_folder(self, files: Dict[str, List[Tuple[str, str, int]]],
+                        folder_type: str, package: SetPackage):
+        """Catalog files in a folder without deep parsing."""
+        folder_type = sys.intern(folder_type)
+        for name, _, size in sorted(chain.from_iterable(files.values())):
+            embedded = EmbeddedFile(
+                name=f"{folder_type}/{name}",
+                file_type=folder_type,
+                offset=0,
+                size=size,
+                data=None  # Don't load data for unknown files
+            )
+            package.add_embedded_file(embedded)
     
     def get_summary(self, package: SetPackage) -> Dict:
         """Get a summary of the parsed package."""
@@ -218,7 +297,7 @@ class FolderSetParser:
             'programs': len(package.programs),
             'multisamples': len(package.multisamples),
             'styles': len(package.styles),
-            'file_types': list(set(f.file_type for f in package.embedded_files))
+            'file_types': list(package.get_file_types())
         }
 
 
@@ -14,6 +14,15 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.korg_types import Multisample, KeyZone, SampleInfo
 
+# Bytes that end a sample filename when scanning back from its extension
+_FILENAME_DELIMITERS = frozenset(b'\x00 /')
+
+# Leading fields of a zone record: low key, high key, root key, fine tune,
+# low velocity, high velocity, sample index, level, pan
+_ZONE = struct.Struct('<BBBbBBHBB')
+_U16 = struct.Struct('<H')
+_U32 = struct.Struct('<I')
+
 
 class KMPParser:
     """Parser for Korg Multisample Parameter (.KMP) format."""
@@ -58,7 +67,7 @@ class KMPParser:
         """
         try:
             # Read basic header
-            version = struct.unpack('<I', data[4:8])[0]
+            version = _U32.unpack_from(data, 4)[0]
             
             # Try to read name from header
             ms_name = name
@@ -77,7 +86,7 @@ class KMPParser:
             # Common layout: zone count at offset 32 or 40
             for zone_offset in [32, 40, 48]:
                 if zone_offset + 2 <= len(data):
-                    num_zones = struct.unpack('<H', data[zone_offset:zone_offset+2])[0]
+                    num_zones = _U16.unpack_from(data, zone_offset)[0]
                     if 1 <= num_zones <= 128:  # Reasonable zone count
                         zones = self._parse_zones(data, zone_offset + 2, num_zones)
                         if zones:
@@ -134,15 +143,8 @@ class KMPParser:
                 pos = offset + i * zone_size
                 
                 try:
-                    low_key = data[pos]
-                    high_key = data[pos + 1]
-                    root_key = data[pos + 2]
-                    fine_tune = struct.unpack('<b', data[pos+3:pos+4])[0]
-                    low_vel = data[pos + 4] if zone_size > 4 else 0
-                    high_vel = data[pos + 5] if zone_size > 5 else 127
-                    sample_idx = struct.unpack('<H', data[pos+6:pos+8])[0] if zone_size > 7 else i
-                    level = data[pos + 8] if zone_size > 8 else 127
-                    pan = data[pos + 9] if zone_size > 9 else 64
+                    (low_key, high_key, root_key, fine_tune, low_vel, high_vel,
+                     sample_idx, level, pan) = _ZONE.unpack_from(data, pos)
                     
                     # Validate
                     if low_key > 127 or high_key > 127 or low_key > high_key:
@@ -195,32 +197,32 @@ class KMPParser:
         """
         references = []
         
-        # Look for .KSF or .ksf strings in the data
-        search_terms = [b'.KSF', b'.ksf', b'.KSF\x00', b'.ksf\x00']
+        # Look for .KSF strings in any case with a single pass over a
+        # lowercased copy; filenames are still read from the original data
+        lowered = data.lower()
         
-        for term in search_terms:
-            pos = 0
-            while True:
-                idx = data.find(term, pos)
-                if idx < 0:
+        pos = 0
+        while True:
+            idx = lowered.find(b'.ksf', pos)
+            if idx < 0:
+                break
+            
+            # Find the start of the filename (scan backwards)
+            start = idx
+            while start > 0 and data[start-1] not in _FILENAME_DELIMITERS:
+                start -= 1
+                if idx - start > 100:  # Filename too long
                     break
-                
-                # Find the start of the filename (scan backwards)
-                start = idx
-                while start > 0 and data[start-1:start] not in [b'\x00', b' ', b'/']:
-                    start -= 1
-                    if idx - start > 100:  # Filename too long
-                        break
-                
-                if start < idx:
-                    try:
-                        filename = data[start:idx+4].decode('ascii', errors='ignore')
-                        if filename and len(filename) > 4:
-                            references.append(filename)
-                    except:
-                        pass
-                
-                pos = idx + 1
+            
+            if start < idx:
+                try:
+                    filename = data[start:idx+4].decode('ascii', errors='ignore')
+                    if filename and len(filename) > 4:
+                        references.append(filename)
+                except:
+                    pass
+            
+            pos = idx + 1
         
         return list(set(references))
 
@@ -15,6 +15,15 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.korg_types import SampleInfo, SampleFormat, LoopMode
 
+# KSF1 header fields from offset 0x08: sample rate, bit depth, channels,
+# sample count, loop start, loop end, loop mode, root key, fine tune
+_KSF1_HEADER = struct.Struct('<IHHIIIBBh')
+# RIFF chunk header (id, size) and the leading fields of a 'fmt ' chunk:
+# format tag, channels, sample rate, byte rate, block align, bits per sample
+_RIFF_CHUNK = struct.Struct('<4sI')
+_WAVE_FMT = struct.Struct('<HHIIHH')
+_U16 = struct.Struct('<H')
+
 
 class KSFParser:
     """Parser for Korg Sample File (.KSF) format."""
@@ -68,15 +77,10 @@ class KSFParser:
             # 0x20: Variable - Sample name (null-terminated or fixed)
             # Variable: Audio data starts after header
             
-            sample_rate = struct.unpack('<I', data[8:12])[0]
-            bit_depth = struct.unpack('<H', data[12:14])[0]
-            channels = struct.unpack('<H', data[14:16])[0]
-            num_samples = struct.unpack('<I', data[16:20])[0]
-            loop_start = struct.unpack('<I', data[20:24])[0]
-            loop_end = struct.unpack('<I', data[24:28])[0]
-            loop_mode = data[28] if len(data) > 28 else 0
-            root_key = data[29] if len(data) > 29 else 60
-            fine_tune = struct.unpack('<h', data[30:32])[0] if len(data) > 31 else 0
+            # parse() only accepts data of at least 44 bytes, so the whole
+            # header is always present
+            (sample_rate, bit_depth, channels, num_samples, loop_start, loop_end,
+             loop_mode, root_key, fine_tune) = _KSF1_HEADER.unpack_from(data, 8)
             
             # Validate parsed values
             if not self._validate_sample_params(sample_rate, bit_depth, channels):
@@ -85,6 +89,7 @@ class KSFParser:
             # Find where audio data starts (after header, typically 64 or 128 bytes)
             data_offset = self._find_audio_data_offset(data, 32)
             data_size = len(data) - data_offset
+            raw_data = data[data_offset:]
             
             return SampleInfo(
                 name=name,
@@ -99,7 +104,8 @@ class KSFParser:
                 fine_tune=fine_tune,
                 data_offset=data_offset,
                 data_size=data_size,
-                raw_data=data[data_offset:]
+                raw_data=raw_data,
+                is_float=bit_depth == 32 and self._looks_like_float(raw_data)
             )
             
         except Exception as e:
@@ -118,19 +124,23 @@ class KSFParser:
             sample_rate = 44100
             bit_depth = 16
             channels = 1
+            is_float = False
             audio_data = None
             data_offset = 0
             
             while pos < len(data) - 8:
-                chunk_id = data[pos:pos+4]
-                chunk_size = struct.unpack('<I', data[pos+4:pos+8])[0]
+                chunk_id, chunk_size = _RIFF_CHUNK.unpack_from(data, pos)
                 
                 if chunk_id == b'fmt ':
                     fmt_data = data[pos+8:pos+8+chunk_size]
-                    audio_format = struct.unpack('<H', fmt_data[0:2])[0]
-                    channels = struct.unpack('<H', fmt_data[2:4])[0]
-                    sample_rate = struct.unpack('<I', fmt_data[4:8])[0]
-                    bit_depth = struct.unpack('<H', fmt_data[14:16])[0]
+                    (audio_format, channels, sample_rate,
+                     _, _, bit_depth) = _WAVE_FMT.unpack_from(fmt_data)
+                    
+                    # WAVE_FORMAT_EXTENSIBLE stores the real format tag
+                    # at the start of the SubFormat GUID
+                    if audio_format == 0xFFFE and len(fmt_data) >= 26:
+                        audio_format = _U16.unpack_from(fmt_data, 24)[0]
+                    is_float = audio_format == 3  # WAVE_FORMAT_IEEE_FLOAT
                     
                 elif chunk_id == b'data':
                     data_offset = pos + 8
@@ -159,7 +169,8 @@ class KSFParser:
                 fine_tune=0,
                 data_offset=data_offset,
                 data_size=len(audio_data),
-                raw_data=audio_data
+                raw_data=audio_data,
+                is_float=is_float
             )
             
         except Exception as e:
@@ -232,6 +243,18 @@ class KSFParser:
             return data_size // bytes_per_sample
         return 0
     
+    def _looks_like_float(self, data: bytes) -> bool:
+        """
+        Heuristic check if 32-bit data is IEEE float rather than int32.
+        Normalized float audio stays within a small range; int32 PCM
+        reinterpreted as float does not.
+        """
+        try:
+            audio = np.frombuffer(data, dtype=np.float32, count=len(data) // 4)
+            return bool(np.all(np.abs(audio) <= 2.0))
+        except Exception:
+            return False
+    
     def _looks_like_audio(self, data: bytes, sample_size: int = 1000) -> bool:
         """
         Heuristic check if data looks like PCM audio.
@@ -288,8 +311,9 @@ class KSFParser:
             elif sample.bit_depth == 32:
                 # 32-bit signed or float
                 try:
-                    audio = np.frombuffer(sample.raw_data, dtype=np.float32)
-                    if np.max(np.abs(audio)) > 2.0:  # Probably int32
+                    if sample.is_float:
+                        audio = np.frombuffer(sample.raw_data, dtype=np.float32)
+                    else:
                         audio = np.frombuffer(sample.raw_data, dtype=np.int32)
                         audio = audio.astype(np.float32) / 2147483648
                 except:
@@ -14,6 +14,15 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.korg_types import Program, Multisample
 
+# Little-endian u32 size field that follows each 4-byte chunk id
+_CHUNK_SIZE = struct.Struct('<I')
+_U16 = struct.Struct('<H')
+
+# Chunk ids recognised while scanning KORG-format PCG data
+_PROGRAM_CHUNKS = frozenset((b'PRG1', b'PROG', b'prg1'))
+_COMBINATION_CHUNKS = frozenset((b'CMB1', b'COMB', b'cmb1'))
+_GLOBAL_CHUNKS = frozenset((b'GLB1', b'GLOB', b'glb1'))
+
 
 class PCGParser:
     """Parser for Korg PCG file format."""
@@ -83,8 +92,8 @@ class PCGParser:
                 # Check for chunk identifiers
                 chunk_id = data[pos:pos+4]
                 
-                if chunk_id in [b'PRG1', b'PROG', b'prg1']:
-                    chunk_size = struct.unpack('<I', data[pos+4:pos+8])[0]
+                if chunk_id in _PROGRAM_CHUNKS:
+                    chunk_size = _CHUNK_SIZE.unpack_from(data, pos + 4)[0]
                     if chunk_size > 0 and pos + 8 + chunk_size <= len(data):
                         chunk_data = data[pos+8:pos+8+chunk_size]
                         progs = self._parse_program_chunk(chunk_data, name)
@@ -92,15 +101,15 @@ class PCGParser:
                         pos += 8 + chunk_size
                         continue
                 
-                elif chunk_id in [b'CMB1', b'COMB', b'cmb1']:
+                elif chunk_id in _COMBINATION_CHUNKS:
                     # Combination chunk - skip for now
-                    chunk_size = struct.unpack('<I', data[pos+4:pos+8])[0]
+                    chunk_size = _CHUNK_SIZE.unpack_from(data, pos + 4)[0]
                     pos += 8 + chunk_size
                     continue
                 
-                elif chunk_id in [b'GLB1', b'GLOB', b'glb1']:
+                elif chunk_id in _GLOBAL_CHUNKS:
                     # Global settings chunk - skip
-                    chunk_size = struct.unpack('<I', data[pos+4:pos+8])[0]
+                    chunk_size = _CHUNK_SIZE.unpack_from(data, pos + 4)[0]
                     pos += 8 + chunk_size
                     continue
                 
@@ -127,7 +136,7 @@ class PCGParser:
             # 0x08: Number of programs
             # 0x0C: Program data offset
             
-            num_programs = struct.unpack('<H', data[8:10])[0]
+            num_programs = _U16.unpack_from(data, 8)[0]
             
             if num_programs > 0 and num_programs < 1000:
                 programs = self._scan_for_programs(data, name, max_programs=num_programs)
@@ -157,10 +166,10 @@ class PCGParser:
             if len(data) < 4:
                 return programs
             
-            num_programs = struct.unpack('<H', data[0:2])[0]
+            num_programs = _U16.unpack_from(data, 0)[0]
             
             if num_programs > 500:  # Probably wrong interpretation
-                num_programs = struct.unpack('<H', data[2:4])[0]
+                num_programs = _U16.unpack_from(data, 2)[0]
             
             if num_programs > 500:
                 return self._scan_for_programs(data, base_name)
@@ -13,6 +13,7 @@ Format structure (discovered through analysis):
 
 import struct
 import os
+import mmap
 import sys
 from typing import Optional, List, Tuple
 import numpy as np
@@ -21,6 +22,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.korg_types import SampleInfo, LoopMode
 
+# Maps printable ASCII to itself and every other byte to 0x00, so the end of
+# a name field is a single bytes.find on the translated entry
+_NAME_BYTE_MAP = bytes(b if 32 <= b <= 126 else 0 for b in range(256))
+
+# 100-byte probe used to guess where audio starts in legacy PCM files
+_AUDIO_PROBE = struct.Struct('<50h')
+
 
 class PCMParser:
     """Parser for Korg Pa-series PCM files."""
@@ -47,13 +55,15 @@ class PCMParser:
         
         # Find KBEG marker (contains offset table)
         kbeg_pos = data.rfind(b'KBEG')
-        kend_pos = data.rfind(b'KEND')
         
         if kbeg_pos < 0:
             if self.debug:
                 print(f"No KBEG marker found in {filename}")
             return self._parse_legacy_format(data, filename)
         
+        # KEND closes the table, so only the footer after KBEG is searched
+        kend_pos = data.rfind(b'KEND', kbeg_pos)
+        
         # Parse sample names from header
         names_map = self._parse_sample_names(data)
         
@@ -85,7 +95,7 @@ class PCMParser:
             
             # Sample rate is at bytes 20-21 as big-endian u16
             if len(sample_header) >= 22:
-                sample_rate = struct.unpack('>H', sample_header[20:22])[0]
+                sample_rate = int.from_bytes(sample_header[20:22], 'big')
                 if sample_rate == 0:
                     sample_rate = self.default_sample_rate
             else:
@@ -138,8 +148,9 @@ class PCMParser:
         """Parse sample names from header and return index->name mapping."""
         names = {}
         
-        # Find KORF signature
-        korf_pos = data.find(b'KORF')
+        # Find KORF signature. The name table never extends past 0x1000, so
+        # there is no point scanning the rest of the file for it.
+        korf_pos = data.find(b'KORF', 0, 0x1000)
         if korf_pos < 0:
             return names
         
@@ -161,22 +172,19 @@ class PCMParser:
             entry = data[pos:pos+24]
             name_bytes = entry[:16]
             
-            # Check for valid name (starts with printable ASCII)
-            if 32 <= name_bytes[0] <= 126:
-                # Find name end (null or non-printable)
+            # Name runs up to the first null or non-printable byte; a valid
+            # entry has at least two printable characters
+            name_end = name_bytes.translate(_NAME_BYTE_MAP).find(b'\x00')
+            if name_end < 0:
                 name_end = 16
-                for j in range(16):
-                    if name_bytes[j] == 0 or not (32 <= name_bytes[j] <= 126):
-                        name_end = j
-                        break
-                
-                if name_end >= 2:
-                    name = name_bytes[:name_end].decode('ascii', errors='replace').strip()
-                    # Sample index is at offset 20 in entry (4th byte of params)
-                    idx = entry[20]
-                    names[idx] = name
-                    pos += 24
-                    continue
+            
+            if name_end >= 2:
+                name = name_bytes[:name_end].decode('ascii', errors='replace').strip()
+                # Sample index is at offset 20 in entry (4th byte of params)
+                idx = entry[20]
+                names[idx] = name
+                pos += 24
+                continue
             
             # No more valid entries
             break
@@ -198,21 +206,22 @@ class PCMParser:
         # First value after KBEG might be a count or header info, skip it
         # Actually check if second value looks like an offset
         if pos + 8 <= len(data):
-            first_val = struct.unpack('>I', data[pos:pos+4])[0]
-            second_val = struct.unpack('>I', data[pos+4:pos+8])[0]
+            first_val = int.from_bytes(data[pos:pos+4], 'big')
+            second_val = int.from_bytes(data[pos+4:pos+8], 'big')
             
             # If second value looks like a valid offset (e.g., 0xE4), skip first
             if second_val > 0x40 and second_val < kbeg_pos:
                 pos += 4  # Skip the first value (likely count or header size)
         
-        while pos < kend_pos - 3:
-            val = struct.unpack('>I', data[pos:pos+4])[0]
-            
-            # Valid offset: reasonable position in file, before KBEG
-            if 0x40 < val < kbeg_pos:
-                offsets.append(val)
-            
-            pos += 4
+        count = min(kend_pos - pos, len(data) - pos) // 4
+        if count <= 0:
+            return offsets
+        
+        # Read the whole table in one go; works directly on bytes or mmap
+        words = np.frombuffer(data, dtype='>u4', count=count, offset=pos)
+        
+        # Valid offset: reasonable position in file, before KBEG
+        offsets = words[(words > 0x40) & (words < kbeg_pos)].tolist()
         
         return offsets
     
@@ -238,7 +247,7 @@ class PCMParser:
             if offset < len(data) - 100:
                 chunk = data[offset:offset+100]
                 # Check if this looks like audio
-                vals = struct.unpack('<50h', chunk)
+                vals = _AUDIO_PROBE.unpack(chunk)
                 max_val = max(abs(v) for v in vals)
                 if max_val > 1000:  # Likely audio
                     audio_start = offset
@@ -262,10 +271,20 @@ class PCMParser:
         return samples
     
     def parse_file(self, filepath: str) -> List[SampleInfo]:
-        """Parse a PCM file from disk."""
+        """
+        Parse a PCM file from disk.
+        
+        The file is memory-mapped rather than read in full, so only the
+        header, footer and sample blocks that are actually sliced get paged
+        in. Samples copy their audio out, so nothing refers to the map once
+        parsing returns.
+        """
+        name = os.path.basename(filepath)
         with open(filepath, 'rb') as f:
-            data = f.read()
-        return self.parse(data, os.path.basename(filepath))
+            if os.fstat(f.fileno()).st_size < 256:
+                return self.parse(f.read(), name)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return self.parse(data, name)
 
 
 def parse_pcm(filepath: str) -> List[SampleInfo]:
@@ -11,6 +11,7 @@ import struct
 import zlib
 import zipfile
 import io
+from operator import itemgetter
 from typing import Optional, List, Tuple, Dict
 from pathlib import Path
 import os
@@ -26,6 +27,12 @@ from parsers.ksf_parser import KSFParser
 from parsers.kmp_parser import KMPParser
 from parsers.pcg_parser import PCGParser
 
+# Record layouts, compiled once: SETi index entries (name, offset, size,
+# flags) and the 32-byte-minimum KORG file table entries (name, offset, size)
+_SETI_ENTRY = struct.Struct('<32sIII')
+_TABLE_ENTRY = struct.Struct('<24sII')
+_U32 = struct.Struct('<I')
+
 
 class SetParser:
     """Parser for Korg SET package files."""
@@ -192,7 +199,7 @@ class SetParser:
             # Try different header layouts
             for offset in [12, 16, 20]:
                 if offset + 4 <= len(data):
-                    count = struct.unpack('<I', data[offset:offset+4])[0]
+                    count = _U32.unpack_from(data, offset)[0]
                     if 0 < count < 1000:
                         file_count = count
                         table_offset = offset + 4
@@ -219,12 +226,12 @@ class SetParser:
             pos = 4
             
             # Version
-            version = struct.unpack('<I', data[pos:pos+4])[0]
+            version = _U32.unpack_from(data, pos)[0]
             package.version = str(version)
             pos += 4
             
             # File count
-            file_count = struct.unpack('<I', data[pos:pos+4])[0]
+            file_count = _U32.unpack_from(data, pos)[0]
             pos += 4
             
             if file_count > 1000:
@@ -244,10 +251,8 @@ class SetParser:
                 # - Flags (4 bytes)
                 # - Reserved (20 bytes)
                 
-                name = data[pos:pos+32].split(b'\x00')[0].decode('ascii', errors='ignore')
-                offset = struct.unpack('<I', data[pos+32:pos+36])[0]
-                size = struct.unpack('<I', data[pos+36:pos+40])[0]
-                flags = struct.unpack('<I', data[pos+40:pos+44])[0]
+                name_bytes, offset, size, flags = _SETI_ENTRY.unpack_from(data, pos)
+                name = name_bytes.split(b'\x00')[0].decode('ascii', errors='ignore')
                 
                 pos += 64
                 
@@ -292,33 +297,28 @@ class SetParser:
             
             for i in range(count):
                 entry_pos = pos + i * entry_size
-                entry = data[entry_pos:entry_pos+entry_size]
                 
                 # Extract file info
                 try:
-                    name_bytes = entry[:24].split(b'\x00')[0]
-                    name = name_bytes.decode('ascii', errors='ignore')
+                    name_bytes, file_offset, file_size = _TABLE_ENTRY.unpack_from(data, entry_pos)
+                    name = name_bytes.split(b'\x00')[0].decode('ascii', errors='ignore')
                     
-                    if entry_size >= 32:
-                        file_offset = struct.unpack('<I', entry[24:28])[0]
-                        file_size = struct.unpack('<I', entry[28:32])[0]
-                        
-                        if file_offset > 0 and file_size > 0:
-                            if file_offset + file_size <= len(data):
-                                valid_entries += 1
-                                
-                                file_data = data[file_offset:file_offset+file_size]
-                                ext = Path(name).suffix.lower() if name else ''
-                                
-                                embedded = EmbeddedFile(
-                                    name=name or f"file_{i:03d}",
-                                    file_type=self.KNOWN_EXTENSIONS.get(ext, identify_file_type(file_data)),
-                                    offset=file_offset,
-                                    size=file_size,
-                                    data=file_data
-                                )
-                                package.embedded_files.append(embedded)
-                                self._parse_embedded_file(embedded, package)
+                    if file_offset > 0 and file_size > 0:
+                        if file_offset + file_size <= len(data):
+                            valid_entries += 1
+                            
+                            file_data = data[file_offset:file_offset+file_size]
+                            ext = Path(name).suffix.lower() if name else ''
+                            
+                            embedded = EmbeddedFile(
+                                name=name or f"file_{i:03d}",
+                                file_type=self.KNOWN_EXTENSIONS.get(ext, identify_file_type(file_data)),
+                                offset=file_offset,
+                                size=file_size,
+                                data=file_data
+                            )
+                            package.embedded_files.append(embedded)
+                            self._parse_embedded_file(embedded, package)
                 except:
                     continue
             
@@ -349,7 +349,7 @@ class SetParser:
                 pos = idx + 1
         
         # Sort by position
-        found_positions.sort(key=lambda x: x[0])
+        found_positions.sort(key=itemgetter(0))
         
         # Extract files between positions
         for i, (pos, sig, ext) in enumerate(found_positions):
@@ -443,7 +443,7 @@ class SetParser:
             'samples': len(package.samples),
             'drum_kits': len(package.drum_kits),
             'styles': len(package.styles),
-            'file_types': list(set(f.file_type for f in package.embedded_files)),
+            'file_types': list(package.get_file_types()),
         }
 
 